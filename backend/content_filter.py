@@ -4,33 +4,155 @@ Implements the smart filtering pipeline described in the revised MVP plan.
 """
 from __future__ import annotations
 
+import contextlib
+import copy
+import json
+import os
 import re
+import stat
+from collections import Counter, OrderedDict
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import yaml
-
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 CONFIG_PATH = ROOT_DIR / "config" / "settings.yaml"
 
+_WS_RE = re.compile(r"\s+")
+_INLINE_FOOTNOTE_RE = re.compile(r"\[(\d+|[ivxlcdm]+)\]")
+
+
+def _strip_inline_footnotes(s: str) -> str:
+    """Remove inline [n]/[iv] markers from a line.
+
+    Numeric markers are by far the common case, so they are spliced out with
+    plain str.find scanning; the regex only runs when a bracket holds
+    anything other than decimal digits.
+    """
+    parts: List[str] = []
+    pos = 0
+    i = s.find("[")
+    while i != -1:
+        j = s.find("]", i + 1)
+        if j == -1:
+            break
+        if not s[i + 1:j].isdecimal():
+            return _INLINE_FOOTNOTE_RE.sub("", s)
+        parts.append(s[pos:i])
+        pos = j + 1
+        i = s.find("[", pos)
+    if not parts:
+        return s
+    parts.append(s[pos:])
+    return "".join(parts)
+
+
+# Parsed YAML keyed by path and validated against (mtime_ns, size), so repeated
+# loads only cost a stat() until the file actually changes on disk. Across
+# process restarts the same check is applied to a "<name>.json" sidecar.
+_SETTINGS_CACHE: "OrderedDict[str, tuple[int, int, Dict]]" = OrderedDict()
+_SETTINGS_CACHE_MAX = 16
+
 
-def _load_settings() -> Dict:
+def _load_settings(path: Optional[Path] = None) -> Dict:
+    config_path = Path(path) if path is not None else CONFIG_PATH
+    key = os.fspath(config_path)
+    # A single stat() doubles as the existence check: a missing file (or a
+    # directory in its place) costs no exception from open() and yields {}.
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as fh:
-            return yaml.safe_load(fh) or {}
+        st = os.stat(key)
     except FileNotFoundError:
         return {}
+    if not stat.S_ISREG(st.st_mode):
+        return {}
+
+    cached = _SETTINGS_CACHE.get(key)
+    if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        _SETTINGS_CACHE.move_to_end(key)
+        return copy.deepcopy(cached[2])
+
+    sidecar = key + ".json"
+    data = _read_settings_sidecar(sidecar, st)
+    if data is None:
+        import yaml
+
+        try:
+            from yaml import CSafeLoader as _YamlLoader
+        except ImportError:  # PyYAML built without libyaml
+            from yaml import SafeLoader as _YamlLoader
+
+        try:
+            with open(key, "r", encoding="utf-8") as fh:
+                data = yaml.load(fh, Loader=_YamlLoader) or {}
+        except FileNotFoundError:
+            return {}
+        _write_settings_sidecar(sidecar, st, data)
+
+    _SETTINGS_CACHE[key] = (st.st_mtime_ns, st.st_size, data)
+    _SETTINGS_CACHE.move_to_end(key)
+    while len(_SETTINGS_CACHE) > _SETTINGS_CACHE_MAX:
+        _SETTINGS_CACHE.popitem(last=False)
+    # Callers get their own copy so mutations never leak into the cache.
+    return copy.deepcopy(data)
+
+
+def _read_settings_sidecar(sidecar: str, st: os.stat_result) -> Optional[Dict]:
+    """Return settings from the JSON sidecar if it was written for this exact YAML file."""
+    try:
+        with open(sidecar, "r", encoding="utf-8") as fh:
+            cached = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    if (
+        not isinstance(cached, dict)
+        or cached.get("mtime_ns") != st.st_mtime_ns
+        or cached.get("size") != st.st_size
+    ):
+        return None
+    return cached.get("settings")
+
+
+def _write_settings_sidecar(sidecar: str, st: os.stat_result, data: Dict) -> None:
+    """Persist parsed settings as JSON so the next process start skips YAML parsing."""
+    try:
+        encoded = json.dumps({"mtime_ns": st.st_mtime_ns, "size": st.st_size, "settings": data})
+    except (TypeError, ValueError):
+        return  # YAML-only types (dates, sets) cannot be cached as JSON
+    if json.loads(encoded)["settings"] != data:
+        return  # e.g. non-string keys would not survive the round trip
+    tmp_path = f"{sidecar}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as fh:
+            fh.write(encoded)
+        os.replace(tmp_path, sidecar)
+    except OSError:
+        # Read-only config directories just lose the cache.
+        with contextlib.suppress(OSError):
+            os.remove(tmp_path)
+
 
+def get_settings(path: Optional[Path] = None) -> Dict:
+    """Return the parsed settings file, re-reading it only when it changes on disk."""
+    return _load_settings(path)
 
-SETTINGS = _load_settings()
+
+def __getattr__(name: str):
+    # SETTINGS is resolved on first access so importing this module for its
+    # filtering helpers does not pull in PyYAML.
+    if name == "SETTINGS":
+        return get_settings()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class ContentFilter:
     """
     Phase 3: Smart Content Parsing utilities.
 
-    Implements a pipeline with steps controlled by config under SETTINGS['content_filtering'].
+    Implements a pipeline with steps controlled by config under settings['content_filtering'].
+    Instances hold only read-only configuration, so one filter can be reused
+    across documents and threads (see default_filter()).
     """
 
     CHAPTER_REGEX = re.compile(
@@ -38,11 +160,16 @@ class ContentFilter:
         re.IGNORECASE,
     )
     PAGE_NUMBER_REGEX = re.compile(r"^\s*(page\s+\d+\s*(of\s*\d+)?|\d+)\s*$", re.IGNORECASE)
-    INLINE_FOOTNOTE_REGEX = re.compile(r"\[(\d+|[ivxlcdm]+)\]")
+    INLINE_FOOTNOTE_REGEX = _INLINE_FOOTNOTE_RE
     FOOTNOTE_LINE_REGEX = re.compile(r"^\s*(\[(\d+|[ivxlcdm]+)\]|\d+[\.)])\s+")
+    # PAGE_NUMBER_REGEX and FOOTNOTE_LINE_REGEX fused so each line needs a single match.
+    LINE_CLASSIFY_REGEX = re.compile(
+        r"^\s*(?:(?P<page>(?i:page\s+\d+\s*(?:of\s*\d+)?)|\d+)\s*$"
+        r"|(?P<fn>\[(?:\d+|[ivxlcdm]+)\]|\d+[\.)])\s+)"
+    )
 
     def __init__(self, settings: Optional[Dict] = None):
-        cfg_source = settings or SETTINGS
+        cfg_source = settings or get_settings()
         if cfg_source and "content_filtering" in cfg_source:
             cfg = cfg_source.get("content_filtering") or {}
         else:
@@ -74,51 +201,68 @@ class ContentFilter:
         if self.skip_headers_footers:
             lines = self._remove_repeated_lines(lines)
 
-        # Remove page numbers lines
-        if self.skip_page_numbers:
-            lines = [ln for ln in lines if not self.PAGE_NUMBER_REGEX.match(ln.strip())]
-
-        # Remove footnote lines and inline refs
-        joined = "\n".join(lines)
-        if self.skip_footnotes:
-            # Remove inline [n] markers
-            joined = self.INLINE_FOOTNOTE_REGEX.sub("", joined)
-            # Remove lines that look like footnotes
-            new_lines = []
-            for ln in joined.splitlines():
-                if self.FOOTNOTE_LINE_REGEX.match(ln.strip()):
-                    # Likely a footnote; drop if relatively short to avoid killing numbered sections
-                    if len(ln.strip()) <= 200:
+        # Single pass over the remaining lines: drop page-number lines, strip
+        # inline [n] markers and drop lines that look like footnotes.
+        skip_pages = self.skip_page_numbers
+        skip_footnotes = self.skip_footnotes
+        if not (skip_pages or skip_footnotes):
+            return "\n".join(lines)
+
+        classify = self.LINE_CLASSIFY_REGEX.match
+        out: List[str] = []
+        append = out.append
+        for ln in lines:
+            if skip_footnotes and "[" in ln:  # literal check is far cheaper than a regex miss
+                ln = _strip_inline_footnotes(ln)
+            stripped = ln.strip()
+            # Page-number and footnote lines can only start with a digit, "[" or
+            # "page"; gate on the first character so most lines never enter the regex.
+            c0 = stripped[:1]
+            m = classify(stripped) if c0 and (c0.isdigit() or c0 in "[pP") else None
+            if m is not None:
+                if m["page"] is not None:
+                    if skip_pages:
                         continue
-                new_lines.append(ln)
-            joined = "\n".join(new_lines)
-        return joined
+                # Likely a footnote; drop if relatively short to avoid killing numbered sections
+                elif skip_footnotes and len(stripped) <= 200:
+                    continue
+            append(ln)
+        return "\n".join(out)
 
     def _find_content_start(self, lines: List[str]) -> Optional[int]:
-        for idx, ln in enumerate(lines[:1000]):  # only scan first ~1000 lines for performance
-            if self.CHAPTER_REGEX.search(ln):
+        chapter_match = self.CHAPTER_REGEX.match  # pattern is anchored; match avoids a scan
+        for idx, ln in enumerate(islice(lines, 1000)):  # only scan first ~1000 lines for performance
+            if chapter_match(ln):
                 return idx
         return None
 
     def _remove_repeated_lines(self, lines: List[str]) -> List[str]:
-        freq: Dict[str, int] = {}
-        norm_map: Dict[int, str] = {}
-        for i, ln in enumerate(lines):
-            norm = ln.strip().lower()
-            norm = re.sub(r"\s+", " ", norm)
-            norm_map[i] = norm
-            if not norm:
-                continue
-            # ignore too long content lines
-            if len(norm) > 80:
+        # Too few lines for running headers/footers to be meaningful.
+        if len(lines) < self.repeat_threshold * 20:
+            return lines
+        # Track 64-bit hashes of the normalized lines rather than the strings
+        # themselves; None marks lines that are never candidates (blank/long).
+        norm_hashes: List[Optional[int]] = []
+        for ln in lines:
+            norm = _WS_RE.sub(" ", ln.strip().lower())
+            # ignore blank and too long content lines
+            if not norm or len(norm) > 80:
+                norm_hashes.append(None)
                 continue
-            freq[norm] = freq.get(norm, 0) + 1
-        repeated = {s for s, c in freq.items() if c > self.repeat_threshold}
+            norm_hashes.append(hash(norm))
+        freq = Counter(h for h in norm_hashes if h is not None)
+        repeated = {h for h, c in freq.items() if c > self.repeat_threshold}
         if not repeated:
             return lines
         out: List[str] = []
-        for i, ln in enumerate(lines):
-            if norm_map.get(i, "") in repeated:
+        for ln, h in zip(lines, norm_hashes):
+            if h in repeated:
                 continue
             out.append(ln)
         return out
+
+
+@lru_cache(maxsize=1)
+def default_filter() -> ContentFilter:
+    """Shared ContentFilter built from settings.yaml."""
+    return ContentFilter()
@@ -1,28 +1,152 @@
 from __future__ import annotations
 
 import hashlib
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 
 SUPPORTED_EXTS = (".pdf", ".epub")
 
 
-def _book_id(path: Path) -> str:
-    return hashlib.sha1(str(path).encode("utf-8")).hexdigest()
+def _book_id(path: str | Path) -> str:
+    return _book_id_for(os.fspath(path))
 
 
-def scan_library(library_path: Path) -> list[dict]:
+# IDs depend only on the path string, so repeated scans of the same library
+# (every frontend refresh) are served from memory. They are also persisted as
+# Annotation.book_id, so the hash must stay SHA-1 for existing notes to resolve.
+@lru_cache(maxsize=16384)
+def _book_id_for(path: str) -> str:
+    return hashlib.sha1(path.encode("utf-8")).hexdigest()
+
+
+# Directory listing releases the GIL, so sibling directories are read
+# concurrently; this matters most for libraries on external or network drives.
+_SCAN_WORKERS = min(8, os.cpu_count() or 1)
+# Created on the first scan that lists more than one directory at a depth and
+# reused afterwards, so a repeated scan served from _DIR_CACHE starts no threads.
+_SCAN_POOL: ThreadPoolExecutor | None = None
+_SCAN_POOL_LOCK = threading.Lock()
+
+
+def _scan_pool() -> ThreadPoolExecutor:
+    global _SCAN_POOL
+    if _SCAN_POOL is not None:
+        return _SCAN_POOL
+    with _SCAN_POOL_LOCK:
+        if _SCAN_POOL is None:
+            _SCAN_POOL = ThreadPoolExecutor(max_workers=_SCAN_WORKERS, thread_name_prefix="library-scan")
+    return _SCAN_POOL
+
+
+def _scan_dir(dir_path: str) -> tuple[list[dict], list[str]]:
+    """Return (books, subdirectories) for a single directory.
+
+    Uses os.scandir so file-type checks come from the cached dirent data
+    instead of a stat() per entry. Like Path.rglob, symlinked directories
+    are not descended into and unreadable directories are skipped.
+    """
+    books: list[dict] = []
+    subdirs: list[str] = []
+    try:
+        with os.scandir(dir_path) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                    continue
+                stem, ext = os.path.splitext(entry.name)
+                ext = ext.lower()
+                if ext not in SUPPORTED_EXTS or not entry.is_file():
+                    continue
+                books.append(
+                    {
+                        "id": _book_id(entry.path),
+                        "title": stem,
+                        "path": entry.path,
+                        "ext": ext,
+                    }
+                )
+    except OSError:
+        pass
+    return books, subdirs
+
+
+# Per-directory listings keyed by the directory's st_mtime_ns. A directory's
+# mtime changes whenever an entry is added, removed or renamed in it, so a
+# rescan only needs one stat() per directory to reuse every unchanged listing.
+_DIR_CACHE: dict[str, tuple[int, list[dict], list[str]]] = {}
+_DIR_CACHE_MAX = 16384
+# FAT/exFAT (2 s) and HFS+ (1 s), common on external drives, store coarse
+# mtimes: an entry added in the same tick as a scan leaves the mtime unchanged.
+# Like git's "racy" index entries, a listing whose mtime is this close to the
+# scan is returned but not cached, so the next scan lists the directory again.
+_RACY_WINDOW_NS = 2_000_000_000
+
+# Last full result per library root: (directory signature, sorted items, id index).
+_SCAN_CACHE: dict[str, tuple[tuple, list[dict], dict[str, dict]]] = {}
+
+
+def _scan_dir_cached(dir_path: str) -> tuple[int | None, list[dict], list[str]]:
+    """Return (mtime_ns, books, subdirectories), mtime_ns None if not cacheable."""
+    try:
+        mtime_ns = os.stat(dir_path).st_mtime_ns
+    except OSError:
+        return None, [], []
+    hit = _DIR_CACHE.get(dir_path)
+    if hit is not None and hit[0] == mtime_ns:
+        return hit
+    # stat() before listing: a change in between only costs an extra rescan.
+    scanned_ns = time.time_ns()
+    books, subdirs = _scan_dir(dir_path)
+    if scanned_ns - mtime_ns < _RACY_WINDOW_NS:
+        _DIR_CACHE.pop(dir_path, None)
+        return None, books, subdirs
+    if len(_DIR_CACHE) >= _DIR_CACHE_MAX:
+        _DIR_CACHE.clear()
+    _DIR_CACHE[dir_path] = (mtime_ns, books, subdirs)
+    return mtime_ns, books, subdirs
+
+
+def _scan(library_path: Path) -> tuple[list[dict], dict[str, dict]]:
+    root = os.fspath(library_path)
     items: list[dict] = []
-    for file_path in library_path.rglob("*"):
-        if not file_path.is_file():
-            continue
-        if file_path.suffix.lower() not in SUPPORTED_EXTS:
-            continue
-        items.append(
-            {
-                "id": _book_id(file_path),
-                "title": file_path.stem,
-                "path": str(file_path),
-                "ext": file_path.suffix.lower(),
-            }
-        )
-    return sorted(items, key=lambda item: item["title"].lower())
+    signature: list[tuple[str, int | None]] = []
+    pending = [root]
+    # Breadth-first: every directory at the current depth is listed in parallel,
+    # except a lone directory (a flat library, or the root), which is read inline.
+    while pending:
+        next_level: list[str] = []
+        if len(pending) == 1:
+            listings = [_scan_dir_cached(pending[0])]
+        else:
+            listings = _scan_pool().map(_scan_dir_cached, pending)
+        for dir_path, (mtime_ns, books, subdirs) in zip(pending, listings):
+            signature.append((dir_path, mtime_ns))
+            items.extend(books)
+            next_level.extend(subdirs)
+        pending = next_level
+
+    key = tuple(signature)
+    cached = _SCAN_CACHE.get(root)
+    if cached is not None and cached[0] == key:
+        return cached[1], cached[2]
+    items.sort(key=lambda item: item["title"].lower())
+    index = {item["id"]: item for item in items}
+    # A listing that could not be cached has no mtime to validate the result by.
+    if all(mtime_ns is not None for _, mtime_ns in signature):
+        _SCAN_CACHE[root] = (key, items, index)
+    else:
+        _SCAN_CACHE.pop(root, None)
+    return items, index
+
+
+def scan_library(library_path: Path) -> list[dict]:
+    return list(_scan(library_path)[0])
+
+
+def find_book(library_path: Path, book_id: str) -> dict | None:
+    """Look up a single book by ID without a linear search of the library."""
+    return _scan(library_path)[1].get(book_id)
@@ -10,24 +10,33 @@ import contextlib
 import json
 import os
 import re
+import shutil
+import struct
 import sys
 import threading
+import time
 import wave
+from collections import OrderedDict
 from datetime import datetime, timezone
+from functools import lru_cache
 from importlib import import_module
+from itertools import accumulate
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import httpx
-import uvicorn
-import yaml
 from fastapi import Depends, FastAPI, File, HTTPException, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from sqlalchemy import DateTime, Float, Integer, String, Text, create_engine
+from sqlalchemy import DateTime, Float, Integer, String, Text, create_engine, delete, event, insert, select, update
 from sqlalchemy.orm import DeclarativeBase, Mapped, Session, mapped_column, sessionmaker
+from sqlalchemy.pool import QueuePool
 from starlette.responses import FileResponse, PlainTextResponse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # ------------------------------------------------------------
 # Config
 # ------------------------------------------------------------
@@ -37,14 +46,12 @@ if str(ROOT_DIR) not in sys.path:
 
 CONFIG_PATH = ROOT_DIR / "config" / "settings.yaml"
 
-try:
-    with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        SETTINGS = yaml.safe_load(f) or {}
-except FileNotFoundError:
-    SETTINGS = {}
+from backend.content_filter import default_filter, get_settings as _load_settings
 
-from backend.content_filter import ContentFilter
-from backend.library import scan_library
+# Parsed with libyaml's CSafeLoader when available (see content_filter._load_settings).
+# Imported under an alias so the /api/settings handler below doesn't shadow it.
+SETTINGS = _load_settings(CONFIG_PATH)
+from backend.library import find_book, scan_library
 from backend.rsvp_tokens import split_paragraphs, tokenize_paragraphs
 
 # Feature flags and TTS defaults
@@ -52,17 +59,20 @@ FEATURE_FLAGS: Dict[str, bool] = (SETTINGS.get("features") or {}) if isinstance(
 LOCAL_TTS_CFG: Dict[str, Optional[str]] = (SETTINGS.get("local_tts") or {}) if isinstance(SETTINGS.get("local_tts"), dict) else {}
 LOCAL_TTS_ENABLED = bool(LOCAL_TTS_CFG.get("enabled", FEATURE_FLAGS.get("local_tts", False)))
 LOCAL_TTS_DEFAULT_VOICE = LOCAL_TTS_CFG.get("default_voice")
+VOICES: List[dict] = SETTINGS.get("voices") or []
+# Voice lookups by name for every TTS request; the first entry with a name wins.
+_VOICES_BY_NAME: Dict[str, dict] = {}
+for _voice in VOICES:
+    if isinstance(_voice, dict) and isinstance(_voice.get("name"), str):
+        _VOICES_BY_NAME.setdefault(_voice["name"], _voice)
 
 # Resolve DB path relative to project root
 _db_rel = SETTINGS.get("database_path", "./db/readme.db")
 DB_PATH = (ROOT_DIR / _db_rel).resolve()
-DB_PATH.parent.mkdir(parents=True, exist_ok=True)
 
-# Simple cache dir (for future use)
+# Simple cache dir (for future use); created by _init_db, not at import
 CACHE_DIR = (ROOT_DIR / SETTINGS.get("cache_dir", "./cache")).resolve()
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
 AUDIO_DIR = (CACHE_DIR / "audio").resolve()
-AUDIO_DIR.mkdir(parents=True, exist_ok=True)
 SUPPORTED_AUDIO_EXTENSIONS = {
     ".mp3": "audio/mpeg",
     ".wav": "audio/wav",
@@ -100,25 +110,24 @@ def _get_library_path() -> Optional[Path]:
     return Path(path_value).expanduser()
 
 
+_LIBRARY_PATH_LINE_RE = re.compile(r"^[ \t]*library_path:.*$", re.MULTILINE)
+
+
 def _set_library_path_in_config(new_path: str) -> None:
     config_text = ""
     if CONFIG_PATH.exists():
         config_text = CONFIG_PATH.read_text(encoding="utf-8")
 
-    if "library_path:" in config_text:
-        updated_lines = []
-        for line in config_text.splitlines():
-            if line.strip().startswith("library_path:"):
-                updated_lines.append(f'library_path: "{new_path}"')
-            else:
-                updated_lines.append(line)
-        config_text = "\n".join(updated_lines) + "\n"
-    elif "# Library Settings" in config_text:
-        prefix, suffix = config_text.split("# Library Settings", 1)
-        config_text = f"{prefix}# Library Settings\nlibrary_path: \"{new_path}\"\n{suffix.lstrip()}"
-    else:
-        spacer = "\n" if config_text and not config_text.endswith("\n") else ""
-        config_text = f"{config_text}{spacer}library_path: \"{new_path}\"\n"
+    line = f'library_path: "{new_path}"'
+    # A function replacement keeps backslashes in Windows paths literal.
+    config_text, replaced = _LIBRARY_PATH_LINE_RE.subn(lambda _m: line, config_text)
+    if not replaced:
+        if "# Library Settings" in config_text:
+            prefix, suffix = config_text.split("# Library Settings", 1)
+            config_text = f"{prefix}# Library Settings\n{line}\n{suffix.lstrip()}"
+        else:
+            spacer = "\n" if config_text and not config_text.endswith("\n") else ""
+            config_text = f"{config_text}{spacer}{line}\n"
 
     CONFIG_PATH.write_text(config_text, encoding="utf-8")
 
@@ -137,7 +146,8 @@ class CurrentBook(Base):
     author: Mapped[Optional[str]] = mapped_column(String(255), nullable=True)
     filepath: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     filetype: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
-    content_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # list[str] JSON
+    # Legacy list[str] JSON, superseded by the sentence table; deferred so reads skip it
+    content_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True, deferred=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
@@ -152,7 +162,22 @@ class PlaybackState(Base):
     last_updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
     # Phase 7: Text-audio sync
     current_sentence_index: Mapped[int] = mapped_column(Integer, default=0)
-    sentence_durations_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # list[float] JSON
+    sentence_durations_json: Mapped[Optional[str]] = mapped_column(Text, nullable=True)  # legacy list[float] JSON
+
+
+class Sentence(Base):
+    """Phase 7: One row per sentence of the current book, with its timing.
+
+    `cum_end` is the sentence's end time in seconds from the start of the
+    book, so the sentence playing at a position is a single indexed lookup.
+    """
+    __tablename__ = "sentences"
+
+    book_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    idx: Mapped[int] = mapped_column(Integer, primary_key=True)
+    text: Mapped[str] = mapped_column(Text, nullable=False)
+    duration: Mapped[float] = mapped_column(Float, nullable=False)
+    cum_end: Mapped[float] = mapped_column(Float, nullable=False, index=True)
 
 
 class Annotation(Base):
@@ -169,17 +194,83 @@ class Annotation(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
 
 
-engine = create_engine(f"sqlite:///{DB_PATH}", connect_args={"check_same_thread": False})
+# Keep a pool of warm connections (PRAGMAs already applied) sized for the
+# threadpool FastAPI uses to run sync dependencies and routes.
+engine = create_engine(
+    f"sqlite:///{DB_PATH}",
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=8,
+    max_overflow=16,
+)
+
+# WAL lets readers proceed while a write is in flight, and synchronous=NORMAL
+# only fsyncs at checkpoints instead of on every commit (still crash-safe in WAL).
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-64000",
+)
+
+
+@event.listens_for(engine, "connect")
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    try:
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+    finally:
+        cursor.close()
+
 SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
 
-# Create tables if not exist
-Base.metadata.create_all(engine)
 
-# Ensure singleton rows exist
-with SessionLocal() as _s:
-    if _s.get(PlaybackState, 1) is None:
-        _s.add(PlaybackState(id=1, speed=START_SPEED))
-        _s.commit()
+def _sentence_rows(book_id: int, sentences: List[str], durations: List[float]) -> List[dict]:
+    """Build `sentences` table rows with running end times for a bulk insert."""
+    return [
+        {"book_id": book_id, "idx": i, "text": text, "duration": duration, "cum_end": cum_end}
+        for i, (text, duration, cum_end) in enumerate(zip(sentences, durations, accumulate(durations)))
+    ]
+
+
+_DB_READY = False
+_DB_INIT_LOCK = threading.Lock()
+
+
+def _init_db() -> None:
+    """Create the data directories, schema and singleton rows on first use instead of at import."""
+    global _DB_READY
+    if _DB_READY:
+        return
+    with _DB_INIT_LOCK:
+        if _DB_READY:
+            return
+        DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+        AUDIO_DIR.mkdir(parents=True, exist_ok=True)  # also creates CACHE_DIR
+        # Create tables if not exist
+        Base.metadata.create_all(engine)
+
+        # Ensure singleton rows exist
+        with SessionLocal() as s:
+            if s.get(PlaybackState, 1) is None:
+                s.add(PlaybackState(id=1, speed=START_SPEED))
+                s.commit()
+            # Books imported before the sentences table existed only have JSON content;
+            # backfill their rows once so the indexed lookups find them.
+            book = s.get(CurrentBook, 1)
+            if book is not None and s.scalar(select(Sentence.idx).where(Sentence.book_id == 1).limit(1)) is None:
+                try:
+                    sentences = _json_loads(book.content_json or "[]")
+                    durations = _json_loads(s.get(PlaybackState, 1).sentence_durations_json or "[]")
+                except ValueError:
+                    sentences, durations = [], []
+                if sentences and len(durations) == len(sentences):
+                    s.execute(insert(Sentence), _sentence_rows(1, sentences, durations))
+                    s.commit()
+        _DB_READY = True
+
 
 # ------------------------------------------------------------
 # FastAPI app
@@ -203,6 +294,7 @@ app.add_middleware(
 
 # DB dependency
 def get_db():
+    _init_db()
     db = SessionLocal()
     try:
         yield db
@@ -213,6 +305,22 @@ def get_db():
 # ------------------------------------------------------------
 # Pydantic Schemas
 # ------------------------------------------------------------
+# The polled status endpoints declare response models so FastAPI serializes
+# them straight to JSON bytes with Pydantic instead of via jsonable_encoder.
+class ServiceInfoResponse(BaseModel):
+    status: str
+    service: str
+    version: str
+
+
+class HealthResponse(BaseModel):
+    status: str
+    database_path: str
+    database_exists: bool
+    cache_dir: str
+    cache_exists: bool
+
+
 class BookImportResult(BaseModel):
     id: int
     title: Optional[str]
@@ -305,9 +413,17 @@ class AnnotationListResponse(BaseModel):
 # ------------------------------------------------------------
 # Utilities
 # ------------------------------------------------------------
+# CPython's re handles this one-character lookbehind in a single linear pass.
+# RE2/Hyperscan cannot express lookbehind, and an equivalent finditer-based
+# splitter benchmarked slower than re.split here.
 SENTENCE_SPLIT_REGEX = re.compile(r"(?<=[.!?。！？])\s+")
 
 
+def _json_loads(data: str):
+    """Decode legacy book content/durations JSON, via orjson when available."""
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
 def _infer_title_from_path(path: str) -> str:
     try:
         return Path(path).stem
@@ -322,10 +438,13 @@ def _split_sentences(text: str) -> List[str]:
     parts = SENTENCE_SPLIT_REGEX.split(text)
     # Fallback if regex did not split
     if len(parts) <= 1:
-        parts = [p.strip() for p in text.splitlines() if p.strip()]
-    return [p.strip() for p in parts if p and p.strip()]
+        parts = text.splitlines()
+    return [p for p in map(str.strip, parts) if p]
 
 
+# Parsers hold only configuration (the shared content filter, PDF zone
+# settings), so one instance per format is reused across imports and threads.
+@lru_cache(maxsize=None)
 def _load_parser(suffix: str):
     module_path, class_name, _ = PARSER_REGISTRY.get(suffix, (None, None, None))
     if not module_path:
@@ -352,11 +471,9 @@ def _read_uploaded_file(upload: UploadFile) -> tuple[str, str]:
 
     # For text-based files, read content directly
     if suffix in {".txt", ".md"}:
-        raw = upload.file.read()
-        try:
-            text = raw.decode("utf-8")
-        except Exception:
-            text = raw.decode("utf-8", errors="ignore")
+        # One lenient decode: identical to a strict decode for valid UTF-8, and
+        # avoids decoding a large file twice when it contains a bad byte.
+        text = upload.file.read().decode("utf-8", errors="ignore")
         return text, suffix.lstrip(".")
 
     # For binary files (PDF, EPUB, DOCX), save to temp file and parse
@@ -364,7 +481,8 @@ def _read_uploaded_file(upload: UploadFile) -> tuple[str, str]:
         import tempfile
 
         with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
-            temp_file.write(upload.file.read())
+            # Stream in 1 MiB chunks rather than holding the whole upload in memory
+            shutil.copyfileobj(upload.file, temp_file, length=1024 * 1024)
             temp_path = Path(temp_file.name)
 
         _, _, normalized_type = PARSER_REGISTRY.get(suffix, (None, None, None))
@@ -383,34 +501,83 @@ def _read_uploaded_file(upload: UploadFile) -> tuple[str, str]:
                 pass
 
 
+def _filter_and_split(text: str) -> List[str]:
+    return _split_sentences(default_filter().filter_text(text))
+
+
 def _calculate_sentence_durations(sentences: List[str], speed: float) -> List[float]:
     """
     Phase 7: Calculate estimated duration for each sentence based on word count and speed.
     Assumes ~150 words per minute reading speed, adjusted for playback speed.
     """
-    durations = []
     words_per_minute = 150.0  # Average reading speed
-    for sentence in sentences:
-        word_count = len(sentence.split())
-        # Duration in seconds: (words / words_per_minute) * 60 / speed
-        duration = (word_count / words_per_minute) * 60.0 / speed if word_count > 0 else 1.0
-        durations.append(max(duration, 0.5))  # Minimum 0.5 seconds per sentence
-    return durations
+    # Duration in seconds: (words / words_per_minute) * 60 / speed, folded into one factor
+    seconds_per_word = 60.0 / (words_per_minute * speed)
+    # Minimum 0.5 seconds per sentence; empty sentences get a flat 1 second
+    return [
+        max(word_count * seconds_per_word, 0.5) if word_count else 1.0
+        for word_count in map(len, map(str.split, sentences))
+    ]
 
 
-def _get_sentence_at_position(sentences: List[str], durations: List[float], position_seconds: float) -> int:
+def _find_sentence_at_position(db: Session, position_seconds: float) -> Optional[tuple[int, str]]:
     """
-    Phase 7: Find which sentence should be highlighted at the given audio position.
+    Phase 7: Indexed lookup of the (index, text) of the sentence playing at a position.
+    Positions past the end resolve to the last sentence; returns None when no content is stored.
     """
-    cumulative_time = 0.0
-    for i, duration in enumerate(durations):
-        if position_seconds < cumulative_time + duration:
-            return i
-        cumulative_time += duration
-    return len(sentences) - 1  # Last sentence if position exceeds total duration
-
-
-def _upsert_current_book(db: Session, *, title: str, filepath: Optional[str], filetype: str, sentences: List[str]) -> CurrentBook:
+    row = db.execute(
+        select(Sentence.idx, Sentence.text)
+        .where(Sentence.book_id == 1, Sentence.cum_end > position_seconds)
+        .order_by(Sentence.cum_end)
+        .limit(1)
+    ).first()
+    if row is None:
+        row = db.execute(
+            select(Sentence.idx, Sentence.text)
+            .where(Sentence.book_id == 1)
+            .order_by(Sentence.idx.desc())
+            .limit(1)
+        ).first()
+    return (row.idx, row.text) if row is not None else None
+
+
+# Decoded sentence lists keyed by (book id, updated_at); a re-import bumps
+# updated_at, so stale entries stop being hit. Import seeds the entry for the
+# new book and close drops everything, so only the open book stays resident.
+_BOOK_CONTENT_CACHE: "OrderedDict[tuple, List[str]]" = OrderedDict()
+_BOOK_CONTENT_CACHE_MAX = 4
+
+
+def _load_book_content(db: Session, row: CurrentBook) -> List[str]:
+    """Return the book's sentences, reading them from the sentence table only on a cache miss."""
+    updated_at = row.updated_at.replace(tzinfo=None) if row.updated_at else None
+    key = (row.id, updated_at)
+    content = _BOOK_CONTENT_CACHE.get(key)
+    if content is not None:
+        _BOOK_CONTENT_CACHE.move_to_end(key)
+        return content
+    content = list(db.scalars(select(Sentence.text).where(Sentence.book_id == row.id).order_by(Sentence.idx)))
+    if not content and row.content_json:
+        # Legacy books whose JSON could not be backfilled into sentence rows
+        try:
+            content = _json_loads(row.content_json)
+        except Exception:
+            content = []
+    _BOOK_CONTENT_CACHE[key] = content
+    while len(_BOOK_CONTENT_CACHE) > _BOOK_CONTENT_CACHE_MAX:
+        _BOOK_CONTENT_CACHE.popitem(last=False)
+    return content
+
+
+def _upsert_current_book(
+    db: Session,
+    *,
+    title: str,
+    filepath: Optional[str],
+    filetype: str,
+    sentences: List[str],
+    durations: Optional[List[float]] = None,
+) -> CurrentBook:
     now = datetime.now(timezone.utc)
     row = db.get(CurrentBook, 1)
     payload = {
@@ -418,7 +585,9 @@ def _upsert_current_book(db: Session, *, title: str, filepath: Optional[str], fi
         "author": None,
         "filepath": filepath,
         "filetype": filetype,
-        "content_json": json.dumps(sentences),
+        # Sentence rows are the stored copy of the text; the JSON columns are
+        # only read to backfill books imported before that table existed.
+        "content_json": None,
         "updated_at": now,
     }
     if row is None:
@@ -433,27 +602,37 @@ def _upsert_current_book(db: Session, *, title: str, filepath: Optional[str], fi
     ps.speed = START_SPEED
     ps.session_start = now
     ps.last_updated = now
+    _reset_session_clock()
     # Phase 7: Calculate and store sentence durations
-    durations = _calculate_sentence_durations(sentences, START_SPEED)
-    ps.sentence_durations_json = json.dumps(durations)
+    if durations is None:
+        durations = _calculate_sentence_durations(sentences, START_SPEED)
+    ps.sentence_durations_json = None
     ps.current_sentence_index = 0
     db.add(ps)
+    db.execute(delete(Sentence).where(Sentence.book_id == 1))
+    if sentences:
+        db.execute(insert(Sentence), _sentence_rows(1, sentences, durations))
+    # Every column was just assigned and the session does not expire on
+    # commit, so the row is already current without a refresh SELECT.
     db.commit()
-    db.refresh(row)
+    # Seed the content cache so the first read after import skips decoding.
+    _BOOK_CONTENT_CACHE.clear()
+    _BOOK_CONTENT_CACHE[(row.id, now.replace(tzinfo=None))] = sentences
     return row
 
 
 # ------------------------------------------------------------
 # Routes
 # ------------------------------------------------------------
-@app.get("/")
+@app.get("/", response_model=ServiceInfoResponse)
 async def root():
     return {"status": "ok", "service": "ReadMe Local API", "version": "0.3.0"}
 
 
-@app.get("/api/health")
+@app.get("/api/health", response_model=HealthResponse)
 async def health_check():
     # Basic checks for DB and directories
+    _init_db()
     db_ok = DB_PATH.exists()
     cache_ok = CACHE_DIR.exists()
     return {
@@ -496,8 +675,7 @@ def get_book(book_id: str):
     if not library_path or not library_path.exists():
         raise HTTPException(status_code=400, detail="Library path not configured")
 
-    items = scan_library(library_path)
-    match = next((item for item in items if item["id"] == book_id), None)
+    match = find_book(library_path, book_id)
     if not match:
         raise HTTPException(status_code=404, detail="Book not found")
 
@@ -527,7 +705,9 @@ async def import_book(file: UploadFile = File(...), db: Session = Depends(get_db
         if existing is not None:
             raise HTTPException(status_code=409, detail="A book is already open. Close it before importing another.")
 
-    result, filetype = _read_uploaded_file(file)
+    # Parsing and filtering are CPU-bound and can take seconds on a large
+    # book; run them in a worker thread so playback polling isn't stalled.
+    result, filetype = await asyncio.to_thread(_read_uploaded_file, file)
 
     # Handle different parser return formats
     if isinstance(result, dict):
@@ -539,12 +719,15 @@ async def import_book(file: UploadFile = File(...), db: Session = Depends(get_db
         # Legacy text-based parsing (TXT/MD)
         text = result
         # Phase 3: Apply smart content filtering before sentence splitting
-        filtered = ContentFilter().filter_text(text)
-        sentences = _split_sentences(filtered)
+        sentences = await asyncio.to_thread(_filter_and_split, text)
         title = _infer_title_from_path(file.filename or "Untitled")
         author = None
 
-    row = _upsert_current_book(db, title=title, filepath=file.filename, filetype=filetype, sentences=sentences)
+    # Timing a large book is pure CPU work; keep it off the event loop.
+    durations = await asyncio.to_thread(_calculate_sentence_durations, sentences, START_SPEED)
+    row = _upsert_current_book(
+        db, title=title, filepath=file.filename, filetype=filetype, sentences=sentences, durations=durations
+    )
     # Update author if available
     if author:
         row.author = author
@@ -566,10 +749,7 @@ async def get_current_book(db: Session = Depends(get_db)):
     row = db.get(CurrentBook, 1)
     if row is None:
         raise HTTPException(status_code=404, detail="No book is currently loaded")
-    try:
-        content = json.loads(row.content_json or "[]")
-    except Exception:
-        content = []
+    content = _load_book_content(db, row)
     return {
         "id": row.id,
         "title": row.title,
@@ -585,6 +765,7 @@ async def close_current_book(db: Session = Depends(get_db)):
     row = db.get(CurrentBook, 1)
     if row is not None:
         db.delete(row)
+    db.execute(delete(Sentence).where(Sentence.book_id == 1))
     ps = db.get(PlaybackState, 1)
     now = datetime.now(timezone.utc)
     if ps is None:
@@ -594,15 +775,35 @@ async def close_current_book(db: Session = Depends(get_db)):
         ps.speed = START_SPEED
         ps.session_start = now
         ps.last_updated = now
+    _reset_session_clock()
     db.add(ps)
     db.commit()
+    _BOOK_CONTENT_CACHE.clear()
     return {"status": "closed"}
 
 
+# Monotonic anchor for the current reading session, reset alongside
+# PlaybackState.session_start. Elapsed time is then immune to wall-clock jumps
+# and needs no datetime math; after a restart the persisted start is used.
+_SESSION_START_MONOTONIC: Optional[float] = None
+
+
+def _reset_session_clock() -> None:
+    global _SESSION_START_MONOTONIC
+    _SESSION_START_MONOTONIC = time.monotonic()
+
+
 def _compute_adaptive_speed(ps: PlaybackState) -> float:
     try:
-        now = datetime.now(timezone.utc)
-        elapsed = max(0.0, (now - (ps.session_start or now)).total_seconds() / 60.0)
+        if _SESSION_START_MONOTONIC is not None:
+            elapsed_s = time.monotonic() - _SESSION_START_MONOTONIC
+        else:
+            now = datetime.now(timezone.utc)
+            start = ps.session_start or now
+            if start.tzinfo is None:  # SQLite hands back naive datetimes (stored as UTC)
+                start = start.replace(tzinfo=timezone.utc)
+            elapsed_s = (now - start).total_seconds()
+        elapsed = max(0.0, elapsed_s / 60.0)
         increments = int(elapsed // max(1, INCREMENT_INTERVAL_MIN))
         speed = START_SPEED + (increments * SPEED_INCREMENT)
         if speed > MAX_SPEED:
@@ -616,42 +817,52 @@ def _compute_adaptive_speed(ps: PlaybackState) -> float:
 
 @app.get("/api/playback/speed", response_model=PlaybackSpeedResponse)
 async def get_playback_speed(db: Session = Depends(get_db)):
-    ps = db.get(PlaybackState, 1)
+    ps = db.execute(
+        select(PlaybackState.speed, PlaybackState.session_start)
+        .where(PlaybackState.id == 1)
+    ).first()
     if ps is None:
         raise HTTPException(status_code=500, detail="Playback state not initialized")
     # Phase 6: adaptive speed based on elapsed session time
     current = _compute_adaptive_speed(ps)
-    # Optionally persist last computed speed for visibility
-    ps.speed = current
-    ps.last_updated = datetime.now(timezone.utc)
-    db.add(ps)
-    db.commit()
+    # Persist the computed speed for visibility, but only when it actually
+    # changes (once per increment interval) so polling stays read-only.
+    if ps.speed != current:
+        db.execute(
+            update(PlaybackState)
+            .where(PlaybackState.id == 1)
+            .values(speed=current, last_updated=datetime.now(timezone.utc))
+        )
+        db.commit()
     return {"speed": current}
 
 
 @app.post("/api/playback/update", response_model=PlaybackUpdateResponse)
 async def update_playback(req: PlaybackUpdateRequest, db: Session = Depends(get_db)):
-    ps = db.get(PlaybackState, 1)
+    ps = db.execute(
+        select(PlaybackState.position_seconds, PlaybackState.speed, PlaybackState.last_updated)
+        .where(PlaybackState.id == 1)
+    ).first()
     if ps is None:
         raise HTTPException(status_code=500, detail="Playback state not initialized")
-    changed = False
+    values = {}
     if req.position_seconds is not None:
-        ps.position_seconds = max(0.0, float(req.position_seconds))
-        changed = True
+        values["position_seconds"] = max(0.0, float(req.position_seconds))
     if req.speed is not None:
         try:
-            ps.speed = max(0.5, min(3.0, float(req.speed)))
+            values["speed"] = max(0.5, min(3.0, float(req.speed)))
         except Exception:
             raise HTTPException(status_code=400, detail="Invalid speed")
-        changed = True
-    if changed:
-        ps.last_updated = datetime.now(timezone.utc)
-        db.add(ps)
+    if values:
+        # The response echoes last_updated, so stamp it here rather than
+        # reading CURRENT_TIMESTAMP back from the database.
+        values["last_updated"] = datetime.now(timezone.utc)
+        db.execute(update(PlaybackState).where(PlaybackState.id == 1).values(**values))
         db.commit()
     return {
-        "position_seconds": ps.position_seconds,
-        "speed": ps.speed,
-        "last_updated": ps.last_updated,
+        "position_seconds": values.get("position_seconds", ps.position_seconds),
+        "speed": values.get("speed", ps.speed),
+        "last_updated": values.get("last_updated", ps.last_updated),
     }
 
 
@@ -684,13 +895,13 @@ async def generate_tts(req: TtsRequest):
 
 @app.get("/api/audio/{job_id}/stream")
 async def stream_audio(job_id: str):
-    path, mime = _locate_audio_file(job_id)
+    path, mime = await asyncio.to_thread(_locate_audio_file, job_id)
     return FileResponse(str(path), media_type=mime, filename=path.name)
 
 
 @app.get("/api/audio/{job_id}/download")
 async def download_audio(job_id: str):
-    path, mime = _locate_audio_file(job_id)
+    path, mime = await asyncio.to_thread(_locate_audio_file, job_id)
     return FileResponse(str(path), media_type=mime, filename=path.name)
 
 
@@ -701,71 +912,65 @@ async def download_audio(job_id: str):
 @app.get("/api/playback/current-sentence", response_model=CurrentSentenceResponse)
 async def get_current_sentence(db: Session = Depends(get_db)):
     """Get the currently highlighted sentence based on playback position."""
-    ps = db.get(PlaybackState, 1)
-    if ps is None:
+    position_seconds = db.scalar(
+        select(PlaybackState.position_seconds).where(PlaybackState.id == 1)
+    )
+    if position_seconds is None:
         raise HTTPException(status_code=500, detail="Playback state not initialized")
 
-    book = db.get(CurrentBook, 1)
-    if book is None:
+    if db.scalar(select(CurrentBook.id).where(CurrentBook.id == 1)) is None:
         raise HTTPException(status_code=404, detail="No book is currently loaded")
 
-    try:
-        sentences = json.loads(book.content_json or "[]")
-        durations = json.loads(ps.sentence_durations_json or "[]")
-    except Exception:
-        raise HTTPException(status_code=500, detail="Failed to parse book content")
-
-    if not sentences or not durations:
-        raise HTTPException(status_code=404, detail="Book content not available")
-
     # Find current sentence based on position
-    sentence_index = _get_sentence_at_position(sentences, durations, ps.position_seconds)
-    sentence_text = sentences[sentence_index] if sentence_index < len(sentences) else ""
-
-    # Update the stored current sentence index
-    ps.current_sentence_index = sentence_index
-    ps.last_updated = datetime.now(timezone.utc)
-    db.add(ps)
+    found = _find_sentence_at_position(db, position_seconds)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Book content not available")
+    sentence_index, sentence_text = found
+
+    # Update the stored current sentence index. The frontend polls this several
+    # times per sentence, so the row is only written when the index moves.
+    db.execute(
+        update(PlaybackState)
+        .where(PlaybackState.id == 1, PlaybackState.current_sentence_index.is_distinct_from(sentence_index))
+        .values(current_sentence_index=sentence_index, last_updated=datetime.now(timezone.utc))
+    )
     db.commit()
 
     return {
         "sentence_index": sentence_index,
         "sentence_text": sentence_text,
-        "position_seconds": ps.position_seconds,
+        "position_seconds": position_seconds,
     }
 
 
 @app.post("/api/playback/sync-sentence")
 async def sync_sentence_position(req: SentenceSyncRequest, db: Session = Depends(get_db)):
     """Update playback position based on sentence index (for seeking)."""
-    ps = db.get(PlaybackState, 1)
-    if ps is None:
-        raise HTTPException(status_code=500, detail="Playback state not initialized")
-
-    book = db.get(CurrentBook, 1)
-    if book is None:
+    if db.scalar(select(CurrentBook.id).where(CurrentBook.id == 1)) is None:
         raise HTTPException(status_code=404, detail="No book is currently loaded")
 
-    try:
-        sentences = json.loads(book.content_json or "[]")
-        durations = json.loads(ps.sentence_durations_json or "[]")
-    except Exception:
-        raise HTTPException(status_code=500, detail="Failed to parse book content")
-
-    if not sentences or not durations:
-        raise HTTPException(status_code=404, detail="Book content not available")
-
     # Validate the requested position
     position_seconds = max(0.0, float(req.position_seconds))
 
     # Find which sentence this position corresponds to
-    sentence_index = _get_sentence_at_position(sentences, durations, position_seconds)
+    found = _find_sentence_at_position(db, position_seconds)
+    if found is None:
+        raise HTTPException(status_code=404, detail="Book content not available")
+    sentence_index = found[0]
 
     # Update playback state
-    ps.position_seconds = position_seconds
-    ps.current_sentence_index = sentence_index
-    ps.last_updated = datetime.now(timezone.utc)
-    db.add(ps)
+    result = db.execute(
+        update(PlaybackState)
+        .where(PlaybackState.id == 1)
+        .values(
+            position_seconds=position_seconds,
+            current_sentence_index=sentence_index,
+            last_updated=datetime.now(timezone.utc),
+        )
+    )
+    if result.rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="Playback state not initialized")
     db.commit()
 
     return {
@@ -778,11 +983,7 @@ async def sync_sentence_position(req: SentenceSyncRequest, db: Session = Depends
 def _get_voice_entry(voice_name: Optional[str]) -> Optional[dict]:
     if not voice_name:
         return None
-    voices = SETTINGS.get("voices") or []
-    for voice in voices:
-        if isinstance(voice, dict) and voice.get("name") == voice_name:
-            return voice
-    return None
+    return _VOICES_BY_NAME.get(voice_name)
 
 
 def _get_tts_service():
@@ -812,16 +1013,50 @@ def _get_tts_service():
                 default_voice=default_voice,
                 default_speaking_rate=speaking_rate,
                 audio_encoding=audio_encoding,
+                cache_dir=CACHE_DIR / "tts",
             )
     return _LOCAL_TTS_SERVICE
 
 
+def _probe_wav_header(path: Path) -> Optional[tuple[float, int]]:
+    """Read duration and sample rate from a canonical 44-byte PCM WAV header.
+
+    Returns None for anything else (extra chunks, non-PCM fmt, truncated file)
+    so the caller can fall back to the wave module.
+    """
+    try:
+        with open(path, "rb") as fh:
+            header = fh.read(44)
+            size = os.fstat(fh.fileno()).st_size
+    except OSError:
+        return None
+    if (
+        len(header) < 44
+        or header[0:4] != b"RIFF"
+        or header[8:12] != b"WAVE"
+        or header[12:16] != b"fmt "
+        or header[36:40] != b"data"
+    ):
+        return None
+    fmt_size, audio_format = struct.unpack_from("<IH", header, 16)
+    sample_rate, byte_rate = struct.unpack_from("<II", header, 24)
+    (data_size,) = struct.unpack_from("<I", header, 40)
+    if fmt_size != 16 or audio_format != 1 or not byte_rate:
+        return None
+    # Streamed writers may leave a placeholder size; trust the file length then.
+    data_size = min(data_size, size - 44)
+    return data_size / float(byte_rate), sample_rate
+
+
 def _probe_audio_metadata(path: Path) -> tuple[Optional[float], Optional[int]]:
     """Probe audio file for duration and sample rate."""
     suffix = path.suffix.lower()
 
     # Handle WAV files
     if suffix == ".wav":
+        probed = _probe_wav_header(path)
+        if probed is not None:
+            return probed
         try:
             with contextlib.closing(wave.open(str(path), "rb")) as wav_file:
                 frames = wav_file.getnframes()
@@ -858,20 +1093,22 @@ async def _call_tts(text: str, *, voice_cfg: Optional[dict]) -> dict:
             language_code = default_cfg.get("language_code")
             speaking_rate = default_cfg.get("speaking_rate")
 
-    loop = asyncio.get_running_loop()
-    actual_path = await loop.run_in_executor(
-        None,
-        lambda: service.synthesize_to_file(
+    def _synthesize_and_probe() -> tuple[Path, Optional[float], Optional[int]]:
+        path = service.synthesize_to_file(
             text=text,
             output_path=output_path,
             speaker=voice_name,
             language=language_code,
             speaking_rate=speaking_rate,
-        ),
-    )
+        )
+        # Google TTS may adjust the extension based on encoding
+        return (path, *_probe_audio_metadata(path))
 
-    # Google TTS may adjust the extension based on encoding
-    duration, sample_rate = _probe_audio_metadata(actual_path)
+    # Synthesis, the audio write and the WAV header probe are all blocking I/O,
+    # so they run together on the executor rather than on the event loop.
+    loop = asyncio.get_running_loop()
+    actual_path, duration, sample_rate = await loop.run_in_executor(None, _synthesize_and_probe)
+    _index_audio_file(job_id, actual_path)
     return {
         "job_id": job_id,
         "duration": duration,
@@ -880,17 +1117,48 @@ async def _call_tts(text: str, *, voice_cfg: Optional[dict]) -> dict:
     }
 
 
+# job_id -> (path, mime) for audio known to be in the cache. Synthesis records
+# its output here, so serving a fresh clip needs no filesystem probing. Hits
+# are revalidated with one stat() in a worker thread, never on the event loop,
+# so deleted clips 404 instead of failing in FileResponse. The oldest entries
+# are dropped beyond _AUDIO_INDEX_MAX.
+_AUDIO_INDEX: "OrderedDict[str, tuple[Path, str]]" = OrderedDict()
+_AUDIO_INDEX_MAX = 4096
+
+
+def _remember_audio_file(job_id: str, path: Path, mime: str) -> None:
+    _AUDIO_INDEX[job_id] = (path, mime)
+    _AUDIO_INDEX.move_to_end(job_id)
+    while len(_AUDIO_INDEX) > _AUDIO_INDEX_MAX:
+        _AUDIO_INDEX.popitem(last=False)
+
+
+def _index_audio_file(job_id: str, path: Path) -> None:
+    mime = SUPPORTED_AUDIO_EXTENSIONS.get(path.suffix.lower())
+    if mime is not None:
+        _remember_audio_file(job_id, path, mime)
+
+
+def _indexed_audio_file(job_id: str) -> Optional[tuple[Path, str]]:
+    """Return the indexed (path, mime) if the file still exists, dropping stale entries."""
+    entry = _AUDIO_INDEX.get(job_id)
+    if entry is not None and not entry[0].exists():
+        _AUDIO_INDEX.pop(job_id, None)
+        entry = None
+    return entry
+
+
 def _locate_audio_file(job_id: str) -> tuple[Path, str]:
+    entry = _indexed_audio_file(job_id)
+    if entry is not None:
+        return entry
+    # Every encoding the TTS service writes has an entry in the table, so a
+    # miss here is a 404 rather than a reason to glob the whole audio cache.
     for ext, mime in SUPPORTED_AUDIO_EXTENSIONS.items():
         candidate = AUDIO_DIR / f"{job_id}{ext}"
         if candidate.exists():
+            _remember_audio_file(job_id, candidate, mime)
             return candidate, mime
-
-    matches = list(AUDIO_DIR.glob(f"{job_id}.*"))
-    if matches:
-        path = matches[0]
-        mime = SUPPORTED_AUDIO_EXTENSIONS.get(path.suffix.lower(), "application/octet-stream")
-        return path, mime
     raise HTTPException(status_code=404, detail="Audio not found")
 
 
@@ -898,7 +1166,7 @@ def _locate_audio_file(job_id: str) -> tuple[Path, str]:
 async def get_settings():
     library_path = _get_library_path()
     return {
-        "voices": SETTINGS.get("voices", []),
+        "voices": VOICES,
         "library_path": str(library_path) if library_path else "",
         "rsvp": {
             "wpm_default": RSVP_DEFAULT_WPM,
@@ -999,12 +1267,30 @@ async def export_annotations(book_id: str, db: Session = Depends(get_db)):
     return PlainTextResponse(content, media_type="text/plain; charset=utf-8")
 
 
+def _warm_parser_imports() -> None:
+    """Import the parser modules (and PyMuPDF/ebooklib/python-docx) ahead of the first upload."""
+    for module_path, _, _ in PARSER_REGISTRY.values():
+        try:
+            import_module(module_path)
+        except Exception:
+            # A missing parser dependency is reported when that format is imported.
+            pass
+
+
 if __name__ == "__main__":
-    # Run the server on localhost only for security
+    # Only needed when run as a script; importing the app (tests, ASGI hosts) skips it.
+    import uvicorn
+
+    # The server is up before this finishes; it only moves the import cost
+    # off the first upload request.
+    threading.Thread(target=_warm_parser_imports, name="parser-warmup", daemon=True).start()
+
+    # Run the server on localhost only for security.
+    # Auto-reload spawns a file-watching supervisor, so it is opt-in for development.
     uvicorn.run(
         "main:app",
         host=SETTINGS.get("local_api_host", "127.0.0.1"),
         port=int(SETTINGS.get("local_api_port", 5000)),
-        reload=True,
-        log_level="info",
+        reload=os.getenv("README_RELOAD") == "1",
+        log_level=os.getenv("README_LOG_LEVEL", "warning"),
     )
@@ -2,39 +2,56 @@
 DOCX Document Parser for ReadMe
 Supports Microsoft Word document parsing with text extraction
 """
+import re
+from pathlib import Path
 from typing import List, Optional
-import docx2txt
-from backend.content_filter import ContentFilter
+from docx import Document
+from docx.oxml.ns import qn
+from docx.text.paragraph import Paragraph
+from backend.content_filter import default_filter
+
+# Same terminator set as main.SENTENCE_SPLIT_REGEX, so DOCX imports split CJK
+# text the same way plain-text imports do.
+SENTENCE_SPLIT_REGEX = re.compile(r"(?<=[.!?。！？])\s+")
 
 
 class DOCXParser:
     """
-    DOCX document parser using docx2txt
+    DOCX document parser using python-docx
     """
 
     def __init__(self):
-        self.content_filter = ContentFilter()
+        self.content_filter = default_filter()
 
     def parse_file(self, file_path: str) -> dict:
         """
         Parse a DOCX file and return structured content
         """
         try:
-            # Extract text from DOCX
-            text_content = docx2txt.process(file_path)
+            # Every paragraph in the body part, in document order, including
+            # those inside tables and content controls (doc.paragraphs only
+            # covers top-level ones). Running headers/footers live in other
+            # parts and never reach the filter.
+            doc = Document(file_path)
+            paragraphs = [
+                text
+                for text in (Paragraph(p, doc).text for p in doc.element.body.iter(qn("w:p")))
+                if text.strip()
+            ]
 
-            if not text_content:
+            if not paragraphs:
                 raise Exception("No text content found in DOCX file")
 
-            # Apply content filtering
-            filtered_text = self.content_filter.filter_text(text_content)
+            # Apply content filtering (front-matter and repeated-line detection
+            # need the whole document, so it runs once over the joined body)
+            filtered_text = self.content_filter.filter_text("\n".join(paragraphs))
 
             # Split into sentences
             sentences = self._split_sentences(filtered_text)
 
             return {
-                "title": self._extract_title(file_path, text_content),
-                "author": None,  # docx2txt doesn't extract metadata easily
+                "title": self._extract_title(file_path, paragraphs),
+                "author": doc.core_properties.author or None,
                 "content": sentences,
                 "num_sentences": len(sentences),
                 "source": "docx"
@@ -43,25 +60,18 @@ class DOCXParser:
         except Exception as e:
             raise Exception(f"Failed to parse DOCX: {str(e)}")
 
-    def _extract_title(self, file_path: str, text_content: str) -> str:
-        """Extract title from file path or first meaningful line"""
-        import os
-        base_name = os.path.splitext(os.path.basename(file_path))[0]
-
-        # Look for title in first few lines
-        lines = text_content.split('\n')[:5]  # Check first 5 lines
-        for line in lines:
+    def _extract_title(self, file_path: str, paragraphs: List[str]) -> str:
+        """Extract title from file path or first meaningful paragraph"""
+        # Look for title in first few paragraphs
+        for line in paragraphs[:5]:  # Check first 5 paragraphs
             line = line.strip()
             if len(line) > 10 and len(line) < 100:  # Reasonable title length
                 # Skip common headers
                 if not any(skip in line.lower() for skip in ['chapter', 'page', 'table of contents']):
                     return line
 
-        return base_name
+        return Path(file_path).stem
 
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
-        import re
-        # Simple sentence splitting - could be enhanced
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-        return [s.strip() for s in sentences if s.strip()]
\ No newline at end of file
+        return [s for s in map(str.strip, SENTENCE_SPLIT_REGEX.split(text.strip())) if s]
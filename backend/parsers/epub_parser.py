@@ -2,11 +2,14 @@
 EPUB Document Parser for ReadMe
 Supports EPUB parsing with chapter extraction and text processing
 """
+import re
 from typing import List, Optional
 import ebooklib
 from ebooklib import epub
-from bs4 import BeautifulSoup
-from backend.content_filter import ContentFilter
+from lxml import etree, html
+from backend.content_filter import default_filter
+
+SENTENCE_SPLIT_REGEX = re.compile(r'(?<=[.!?])\s+')
 
 
 class EPUBParser:
@@ -15,7 +18,7 @@ class EPUBParser:
     """
 
     def __init__(self):
-        self.content_filter = ContentFilter()
+        self.content_filter = default_filter()
 
     def parse_file(self, file_path: str) -> dict:
         """
@@ -23,18 +26,14 @@ class EPUBParser:
         """
         try:
             book = epub.read_epub(file_path)
-            text_content = ""
+            chapters = []
 
             # Extract text from all chapters
             for item in book.get_items():
                 if item.get_type() == ebooklib.ITEM_DOCUMENT:
-                    soup = BeautifulSoup(item.get_content(), 'html.parser')
-                    # Remove script and style elements
-                    for script in soup(["script", "style"]):
-                        script.extract()
-                    # Get text
-                    chapter_text = soup.get_text()
-                    text_content += chapter_text + "\n\n"
+                    chapters.append(self._chapter_text(item.get_content()))
+            # Every chapter is followed by a blank line, as with the original accumulation
+            text_content = "\n\n".join([*chapters, ""])
 
             # Apply content filtering
             filtered_text = self.content_filter.filter_text(text_content)
@@ -47,12 +46,27 @@ class EPUBParser:
                 "author": self._extract_author(book),
                 "content": sentences,
                 "num_sentences": len(sentences),
-                "total_chapters": len([item for item in book.get_items() if item.get_type() == ebooklib.ITEM_DOCUMENT])
+                "total_chapters": len(chapters)
             }
 
         except Exception as e:
             raise Exception(f"Failed to parse EPUB: {str(e)}")
 
+    @staticmethod
+    def _chapter_text(content: bytes) -> str:
+        """Return a chapter's text with script and style elements removed"""
+        if not content.strip():
+            return ""
+        tree = html.fromstring(content)
+        # Drop the elements but keep the text that follows them
+        etree.strip_elements(tree, 'script', 'style', with_tail=False)
+        # Collapse indentation-only text between tags the way BeautifulSoup
+        # did, so chapters keep the same line structure for the content filter
+        return "".join(
+            ("\n" if "\n" in text else " ") if text.isspace() else text
+            for text in tree.itertext()
+        )
+
     def _extract_title(self, book) -> str:
         """Extract title from EPUB metadata"""
         title = book.get_metadata('DC', 'title')
@@ -69,7 +83,6 @@ class EPUBParser:
 
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences"""
-        import re
         # Simple sentence splitting - could be enhanced
-        sentences = re.split(r'(?<=[.!?])\s+', text.strip())
-        return [s.strip() for s in sentences if s.strip()]
\ No newline at end of file
+        sentences = SENTENCE_SPLIT_REGEX.split(text.strip())
+        return [s for s in map(str.strip, sentences) if s]
\ No newline at end of file
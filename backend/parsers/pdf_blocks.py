@@ -1,41 +1,53 @@
 """Position-aware PDF text block extraction using PyMuPDF."""
-from dataclasses import dataclass
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Literal, Optional
+from typing import List, Optional
 
-import yaml
+from backend.content_filter import get_settings
 
 ROOT_DIR = Path(__file__).resolve().parents[2]
 CONFIG_PATH = ROOT_DIR / "config" / "settings.yaml"
+_WS_RE = re.compile(r"\s+")
 
 
 def _load_pdf_config() -> dict:
-    try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            settings = yaml.safe_load(f) or {}
-        return settings.get("pdf_filtering", {})
-    except FileNotFoundError:
-        return {}
+    # get_settings caches the parsed file and only re-reads it after an edit,
+    # so building an extractor per parse costs a stat() rather than a YAML load.
+    return get_settings(CONFIG_PATH).get("pdf_filtering") or {}
 
 
-@dataclass
+@dataclass(slots=True)
 class TextBlock:
-    """A text block with position and font metadata."""
+    """A text block with position and font metadata.
+
+    Slotted: long PDFs produce tens of thousands of blocks, and dropping the
+    per-instance __dict__ keeps the block list compact.
+    """
     text: str
     x0: float
     y0: float
     x1: float
     y1: float
     page_height: float
-    font_size: float
+    # Not read by zone classification; 0.0 when extracted in "blocks" mode,
+    # which carries no span font data.
+    font_size: float = 0.0
     page_num: int = 0
+    _norm: Optional[str] = field(default=None, init=False, repr=False, compare=False)
 
-
-ZoneType = Literal["header", "body", "footer"]
+    @property
+    def normalized(self) -> str:
+        """Lowercased, whitespace-collapsed text, computed once per block."""
+        norm = self._norm
+        if norm is None:
+            norm = self._norm = _WS_RE.sub(" ", self.text.strip().lower())
+        return norm
 
 
 class PDFBlockExtractor:
-    """Extract and classify text blocks from PDFs by position."""
+    """Extract text blocks from PDFs, optionally dropping header/footer zones."""
 
     def __init__(
         self,
@@ -48,87 +60,73 @@ class PDFBlockExtractor:
         self.footer_zone_percent = cfg.get("footer_zone_percent", footer_zone_percent)
         self.min_body_font_size = cfg.get("min_body_font_size", min_body_font_size)
 
-    def classify_zone(self, block: TextBlock) -> ZoneType:
-        """Classify a block as header, body, or footer based on Y position."""
-        relative_y = block.y0 / block.page_height
-
-        if relative_y < self.header_zone_percent:
-            return "header"
-        elif relative_y > (1 - self.footer_zone_percent):
-            return "footer"
-        return "body"
-
-    def extract_blocks(self, file_path: str) -> tuple[List[TextBlock], int]:
+    def extract_blocks(self, file_path: str, body_only: bool = False) -> tuple[List[TextBlock], int, dict]:
         """
         Extract text blocks with coordinates from a PDF file.
 
+        With body_only, blocks starting in the header or footer zone are
+        skipped before their text is joined or a TextBlock is built.
+
         Returns:
-            Tuple of (blocks, page_count) to avoid reopening the file.
+            Tuple of (blocks, page_count, metadata) to avoid reopening the file.
         """
         import fitz  # PyMuPDF
 
+        top = self.header_zone_percent
+        bottom = 1 - self.footer_zone_percent
         blocks: List[TextBlock] = []
-        doc = fitz.open(file_path)
-        page_count = len(doc)
-
-        for page_num in range(page_count):
-            page = doc.load_page(page_num)
-            page_height = page.rect.height
-
-            # Get text blocks with position info
-            block_list = page.get_text("dict", flags=fitz.TEXT_PRESERVE_WHITESPACE)["blocks"]
-
-            for b in block_list:
-                if b.get("type") != 0:  # Skip non-text blocks (images)
-                    continue
-
-                # Extract text and font info from spans
-                text_parts = []
-                font_sizes = []
-
-                for line in b.get("lines", []):
-                    for span in line.get("spans", []):
-                        text_parts.append(span.get("text", ""))
-                        font_sizes.append(span.get("size", 12))
-
-                text = " ".join(text_parts).strip()
-                if not text:
-                    continue
-
-                avg_font_size = sum(font_sizes) / len(font_sizes) if font_sizes else 12
-
-                blocks.append(TextBlock(
-                    text=text,
-                    x0=b["bbox"][0],
-                    y0=b["bbox"][1],
-                    x1=b["bbox"][2],
-                    y1=b["bbox"][3],
-                    page_height=page_height,
-                    font_size=avg_font_size,
-                    page_num=page_num,
-                ))
-
-        doc.close()
-        return blocks, page_count
-
-    def find_repeated_headers(self, blocks: List[TextBlock], threshold: int = 3) -> set:
-        """Find text that appears repeatedly at similar Y positions (likely headers/footers)."""
-        from collections import defaultdict
-        import re
-
-        # Group by normalized text
-        text_positions: defaultdict = defaultdict(list)
+        # Iterate pages straight off the document; the context manager closes
+        # it even if a page fails to parse.
+        with fitz.open(file_path) as doc:
+            page_count = len(doc)
+            metadata = doc.metadata or {}
+
+            for page_num, page in enumerate(doc):
+                page_height = page.rect.height
+
+                # Flat (x0, y0, x1, y1, text, block_no, block_type) tuples; far
+                # cheaper than walking the nested "dict" output span by span.
+                block_list = page.get_text("blocks", flags=fitz.TEXT_PRESERVE_WHITESPACE)
+
+                for x0, y0, x1, y1, raw_text, _block_no, block_type in block_list:
+                    if block_type != 0:  # Skip non-text blocks (images)
+                        continue
+                    if body_only and not top <= y0 / page_height <= bottom:
+                        continue
+
+                    # One line per block, as the span-joining extraction produced
+                    text = " ".join(raw_text.splitlines()).strip()
+                    if not text:
+                        continue
+
+                    blocks.append(TextBlock(
+                        text=text,
+                        x0=x0,
+                        y0=y0,
+                        x1=x1,
+                        y1=y1,
+                        page_height=page_height,
+                        page_num=page_num,
+                    ))
+
+        return blocks, page_count, metadata
+
+    def extract_body_blocks(self, file_path: str) -> tuple[List[TextBlock], int, dict]:
+        """Extract only the blocks in the body zone, plus page count and metadata."""
+        return self.extract_blocks(file_path, body_only=True)
+
+    def find_repeated_headers(self, blocks: List[TextBlock], threshold: int = 3) -> frozenset[str]:
+        """Find text that appears repeatedly at similar Y positions (likely headers/footers).
+
+        Returns a frozenset of normalized text so callers get O(1) membership tests.
+        """
+        # Group by normalized text; only the distinct pages matter
+        text_pages: defaultdict = defaultdict(set)
         for block in blocks:
-            normalized = re.sub(r"\s+", " ", block.text.strip().lower())
+            normalized = block.normalized
             if len(normalized) > 80:  # Skip long content
                 continue
-            text_positions[normalized].append((block.y0, block.page_num))
-
-        # Find text appearing on multiple pages at similar positions
-        repeated = set()
-        for text, positions in text_positions.items():
-            unique_pages = len(set(p[1] for p in positions))
-            if unique_pages >= threshold:
-                repeated.add(text)
+            text_pages[normalized].add(block.page_num)
 
-        return repeated
+        # Find text appearing on multiple pages
+        return frozenset(text for text, pages in text_pages.items() if len(pages) >= threshold)
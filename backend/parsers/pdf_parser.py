@@ -3,13 +3,16 @@ PDF Document Parser for ReadMe
 Supports PDF parsing with text extraction and position-aware filtering
 """
 import re
+from pathlib import Path
 from typing import List, Optional
 
 import fitz  # PyMuPDF
 
-from backend.content_filter import ContentFilter
+from backend.content_filter import default_filter
 from backend.parsers.pdf_blocks import PDFBlockExtractor
 
+SENTENCE_SPLIT_REGEX = re.compile(r"(?<=[.!?])\s+")
+
 
 class PDFParser:
     """
@@ -18,7 +21,7 @@ class PDFParser:
     """
 
     def __init__(self, use_position_filtering: bool = True):
-        self.content_filter = ContentFilter()
+        self.content_filter = default_filter()
         self.use_position_filtering = use_position_filtering
         self.block_extractor = PDFBlockExtractor()
 
@@ -27,9 +30,9 @@ class PDFParser:
         try:
             # Extract text using appropriate method
             if self.use_position_filtering:
-                text_content, total_pages = self._extract_with_position_filtering(file_path)
+                text_content, total_pages, raw_metadata = self._extract_with_position_filtering(file_path)
             else:
-                text_content, total_pages = self._extract_simple(file_path)
+                text_content, total_pages, raw_metadata = self._extract_simple(file_path)
 
             # Apply content filtering
             filtered_text = self.content_filter.filter_text(text_content)
@@ -37,9 +40,12 @@ class PDFParser:
             # Split into sentences
             sentences = self._split_sentences(filtered_text)
 
+            # Prefer the document's Info dictionary over guessing from text
+            metadata = self._clean_metadata(raw_metadata)
+
             return {
-                "title": self._extract_title(file_path, text_content),
-                "author": self._extract_author(text_content),
+                "title": metadata.get("title") or self._extract_title(file_path, text_content),
+                "author": metadata.get("author") or self._extract_author(text_content),
                 "content": sentences,
                 "num_sentences": len(sentences),
                 "total_pages": total_pages,
@@ -48,34 +54,32 @@ class PDFParser:
         except Exception as e:
             raise Exception(f"Failed to parse PDF: {str(e)}")
 
-    def _extract_simple(self, file_path: str) -> tuple[str, int]:
+    def _extract_simple(self, file_path: str) -> tuple[str, int, dict]:
         """
         Extract text without position filtering (original method).
 
         Returns:
-            Tuple of (text_content, page_count).
+            Tuple of (text_content, page_count, metadata).
         """
-        doc = fitz.open(file_path)
-        text_content = ""
-        page_count = len(doc)
-
-        for page_num in range(page_count):
-            page = doc.load_page(page_num)
-            page_text = page.get_text()
-            text_content += page_text + "\n"
+        with fitz.open(file_path) as doc:
+            page_count = len(doc)
+            metadata = doc.metadata or {}
+            page_texts = [page.get_text() for page in doc]
 
-        doc.close()
-        return text_content, page_count
+        # Each page is followed by a newline, as with the original accumulation
+        page_texts.append("")
+        return "\n".join(page_texts), page_count, metadata
 
-    def _extract_with_position_filtering(self, file_path: str) -> tuple[str, int]:
+    def _extract_with_position_filtering(self, file_path: str) -> tuple[str, int, dict]:
         """
         Extract text with position-aware filtering.
         Filters out header/footer zones and repeated text.
 
         Returns:
-            Tuple of (text_content, page_count).
+            Tuple of (text_content, page_count, metadata).
         """
-        blocks, page_count = self.block_extractor.extract_blocks(file_path)
+        # Header and footer zones are dropped during extraction
+        blocks, page_count, metadata = self.block_extractor.extract_body_blocks(file_path)
 
         # Find repeated headers/footers
         repeated_text = self.block_extractor.find_repeated_headers(blocks)
@@ -83,31 +87,34 @@ class PDFParser:
         # Filter blocks
         filtered_blocks = []
         for block in blocks:
-            zone = self.block_extractor.classify_zone(block)
-
-            # Skip header and footer zones
-            if zone in ("header", "footer"):
-                continue
-
             # Skip repeated text (likely running headers)
-            normalized = re.sub(r"\s+", " ", block.text.strip().lower())
-            if normalized in repeated_text:
+            if block.normalized in repeated_text:
                 continue
 
             filtered_blocks.append(block)
 
         # Combine filtered blocks into text
         text_parts = [block.text for block in filtered_blocks]
-        return "\n".join(text_parts), page_count
+        return "\n".join(text_parts), page_count, metadata
 
-    def _extract_title(self, file_path: str, text_content: str) -> str:
-        """Extract title from PDF metadata or first meaningful line."""
-        import os
+    @staticmethod
+    def _clean_metadata(metadata: dict) -> dict:
+        """Return the non-empty title/author entries of the PDF's metadata.
 
-        base_name = os.path.splitext(os.path.basename(file_path))[0]
+        The metadata is read from the document already opened for text
+        extraction, so the file is never opened a second time.
+        """
+        return {
+            key: value.strip()
+            for key in ("title", "author")
+            if isinstance(value := metadata.get(key), str) and value.strip()
+        }
 
-        # Look for title in first few lines
-        lines = text_content.split("\n")[:10]
+    def _extract_title(self, file_path: str, text_content: str) -> str:
+        """Extract title from PDF metadata or first meaningful line."""
+        # Look for title in first few lines; maxsplit keeps the rest of the
+        # book in one unsplit remainder instead of a list of every line
+        lines = text_content.split("\n", 10)[:10]
         for line in lines:
             line = line.strip()
             if 10 < len(line) < 100:  # Reasonable title length
@@ -116,7 +123,7 @@ class PDFParser:
                 if not any(skip in line.lower() for skip in skip_words):
                     return line
 
-        return base_name
+        return Path(file_path).stem
 
     def _extract_author(self, text_content: str) -> Optional[str]:
         """Try to extract author from content (basic implementation)."""
@@ -124,5 +131,5 @@ class PDFParser:
 
     def _split_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
-        sentences = re.split(r"(?<=[.!?])\s+", text.strip())
-        return [s.strip() for s in sentences if s.strip()]
+        sentences = SENTENCE_SPLIT_REGEX.split(text.strip())
+        return [s for s in map(str.strip, sentences) if s]
@@ -3,18 +3,19 @@ from __future__ import annotations
 import re
 
 PUNCTUATION = {",", ";", ":", ".", "!", "?"}
+_PARAGRAPH_BREAK_RE = re.compile(r"\n\s*\n+")
+_WORD_RE = re.compile(r"[A-Za-z0-9]+(?:['-][A-Za-z0-9]+)?|[.,;:!?]")
 
 
 def split_paragraphs(text: str) -> list[str]:
-    chunks = re.split(r"\n\s*\n+", text.strip())
+    chunks = _PARAGRAPH_BREAK_RE.split(text.strip())
     return [chunk.strip() for chunk in chunks if chunk.strip()]
 
 
 def tokenize_paragraphs(paragraphs: list[str]) -> list[dict]:
     tokens: list[dict] = []
-    word_re = re.compile(r"[A-Za-z0-9]+(?:['-][A-Za-z0-9]+)?|[.,;:!?]")
     for p_index, paragraph in enumerate(paragraphs):
-        for match in word_re.findall(paragraph):
+        for match in _WORD_RE.findall(paragraph):
             if match in PUNCTUATION and tokens:
                 tokens[-1]["punct"] = match
                 if match in {".", "!", "?"}:
@@ -3,6 +3,36 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
+import pytest
+
 ROOT_DIR = Path(__file__).resolve().parents[2]
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
+
+
+@pytest.fixture
+def temp_db(tmp_path, monkeypatch):
+    """Bind backend.main to a throwaway SQLite database for one test.
+
+    Tests that write through the API would otherwise close the developer's
+    open book and overwrite their playback position in db/readme.db.
+    """
+    from collections import OrderedDict
+
+    from sqlalchemy import create_engine, event
+    from sqlalchemy.orm import sessionmaker
+
+    import backend.main as main
+
+    db_path = tmp_path / "readme.db"
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", main._apply_sqlite_pragmas)
+    monkeypatch.setattr(main, "DB_PATH", db_path)
+    monkeypatch.setattr(main, "AUDIO_DIR", tmp_path / "audio")
+    monkeypatch.setattr(main, "engine", engine)
+    monkeypatch.setattr(main, "SessionLocal", sessionmaker(bind=engine, expire_on_commit=False))
+    monkeypatch.setattr(main, "_DB_READY", False)
+    monkeypatch.setattr(main, "_BOOK_CONTENT_CACHE", OrderedDict())
+    monkeypatch.setattr(main, "_SESSION_START_MONOTONIC", None)
+    yield main
+    engine.dispose()
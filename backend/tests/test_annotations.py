@@ -6,7 +6,7 @@ from backend.main import app
 client = TestClient(app)
 
 
-def test_create_annotation():
+def test_create_annotation(temp_db):
     """POST /api/annotations should create an annotation."""
     response = client.post("/api/annotations", json={
         "book_id": "test-book-123",
@@ -22,7 +22,7 @@ def test_create_annotation():
     assert "id" in data
 
 
-def test_list_annotations():
+def test_list_annotations(temp_db):
     """GET /api/annotations/{book_id} should list annotations for a book."""
     # First create one
     client.post("/api/annotations", json={
@@ -39,7 +39,7 @@ def test_list_annotations():
     assert data["total"] >= 1
 
 
-def test_delete_annotation():
+def test_delete_annotation(temp_db):
     """DELETE /api/annotations/{id} should delete an annotation."""
     # Create one first
     create_resp = client.post("/api/annotations", json={
@@ -60,7 +60,7 @@ def test_delete_annotation():
     assert annotation_id not in ids
 
 
-def test_export_annotations():
+def test_export_annotations(temp_db):
     """GET /api/annotations/{book_id}/export should return TXT export."""
     # Create an annotation
     client.post("/api/annotations", json={
@@ -0,0 +1,91 @@
+"""Tests for synthesized audio metadata probing."""
+import contextlib
+import wave
+from collections import OrderedDict
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+
+import backend.main as main
+from backend.main import _probe_audio_metadata, _probe_wav_header
+
+
+def _write_wav(path, *, rate=24000, frames=12000, channels=1):
+    with contextlib.closing(wave.open(str(path), "wb")) as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(2)
+        wav.setframerate(rate)
+        wav.writeframes(b"\x00\x00" * channels * frames)
+
+
+def test_wav_header_probe_matches_wave_module(tmp_path):
+    path = tmp_path / "clip.wav"
+    _write_wav(path, rate=24000, frames=12000, channels=2)
+
+    assert _probe_wav_header(path) == (0.5, 24000)
+    assert _probe_audio_metadata(path) == (0.5, 24000)
+
+
+def test_wav_probe_falls_back_for_non_canonical_headers(tmp_path):
+    path = tmp_path / "clip.wav"
+    _write_wav(path, rate=16000, frames=16000)
+    data = path.read_bytes()
+    # Insert a LIST chunk between fmt and data, as some encoders do
+    extra = b"LIST" + (4).to_bytes(4, "little") + b"INFO"
+    patched = data[:36] + extra + data[36:]
+    patched = patched[:4] + (len(patched) - 8).to_bytes(4, "little") + patched[8:]
+    path.write_bytes(patched)
+
+    assert _probe_wav_header(path) is None
+    assert _probe_audio_metadata(path) == (1.0, 16000)
+
+
+def test_probe_returns_none_for_compressed_audio(tmp_path):
+    path = tmp_path / "clip.mp3"
+    path.write_bytes(b"ID3")
+
+    assert _probe_audio_metadata(path) == (None, None)
+
+
+def test_audio_lookup_is_limited_to_supported_extensions(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(main, "_AUDIO_INDEX", OrderedDict())
+    (tmp_path / "tts-1.ogg").write_bytes(b"OggS")
+    (tmp_path / "tts-2.tmp").write_bytes(b"partial")
+
+    assert main._locate_audio_file("tts-1") == (tmp_path / "tts-1.ogg", "audio/ogg")
+    with pytest.raises(HTTPException) as exc:
+        main._locate_audio_file("tts-2")
+    assert exc.value.status_code == 404
+    assert main._AUDIO_INDEX == {"tts-1": (tmp_path / "tts-1.ogg", "audio/ogg")}
+
+
+def test_audio_stream_serves_indexed_clip(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "_AUDIO_INDEX", OrderedDict())
+    clip = tmp_path / "tts-3.mp3"
+    clip.write_bytes(b"ID3 audio")
+    main._index_audio_file("tts-3", clip)
+
+    res = TestClient(main.app).get("/api/audio/tts-3/stream")
+    assert res.status_code == 200
+    assert res.headers["content-type"] == "audio/mpeg"
+    assert res.content == b"ID3 audio"
+
+
+def test_audio_index_drops_deleted_clips_and_stays_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "AUDIO_DIR", tmp_path)
+    monkeypatch.setattr(main, "_AUDIO_INDEX", OrderedDict())
+    monkeypatch.setattr(main, "_AUDIO_INDEX_MAX", 2)
+    clip = tmp_path / "tts-4.mp3"
+    clip.write_bytes(b"ID3 audio")
+    main._index_audio_file("tts-4", clip)
+    clip.unlink()
+
+    res = TestClient(main.app).get("/api/audio/tts-4/stream")
+    assert res.status_code == 404
+    assert "tts-4" not in main._AUDIO_INDEX
+
+    for n in range(5, 8):
+        main._index_audio_file(f"tts-{n}", tmp_path / f"tts-{n}.mp3")
+    assert list(main._AUDIO_INDEX) == ["tts-6", "tts-7"]
@@ -0,0 +1,79 @@
+"""Tests for the shared content filtering pipeline."""
+import os
+import sys
+from pathlib import Path
+
+from backend import content_filter
+from backend.content_filter import ContentFilter, get_settings
+
+
+def test_get_settings_reuses_cache_until_file_changes(tmp_path: Path):
+    settings_path = tmp_path / "settings.yaml"
+    settings_path.write_text("content_filtering:\n  repeat_threshold: 4\n", encoding="utf-8")
+
+    first = get_settings(settings_path)
+    first["content_filtering"]["repeat_threshold"] = 99  # must not leak into the cache
+    assert get_settings(settings_path)["content_filtering"]["repeat_threshold"] == 4
+
+    settings_path.write_text("content_filtering:\n  repeat_threshold: 7\n", encoding="utf-8")
+    st = settings_path.stat()
+    os.utime(settings_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert get_settings(settings_path)["content_filtering"]["repeat_threshold"] == 7
+
+
+def test_get_settings_json_sidecar_tracks_yaml_file(tmp_path: Path, monkeypatch):
+    settings_path = tmp_path / "settings.yaml"
+    settings_path.write_text("library_path: \"/books\"\n", encoding="utf-8")
+    sidecar = tmp_path / "settings.yaml.json"
+
+    assert get_settings(settings_path) == {"library_path": "/books"}
+    assert sidecar.exists()
+
+    # A fresh process (empty in-memory cache) is served from the sidecar.
+    monkeypatch.setattr(content_filter, "_SETTINGS_CACHE", type(content_filter._SETTINGS_CACHE)())
+    monkeypatch.setitem(sys.modules, "yaml", None)
+    assert get_settings(settings_path) == {"library_path": "/books"}
+
+
+def test_get_settings_missing_file_returns_empty(tmp_path: Path):
+    assert get_settings(tmp_path / "missing.yaml") == {}
+    assert get_settings(tmp_path) == {}
+
+
+def test_content_filter_accepts_explicit_settings():
+    cf = ContentFilter({"content_filtering": {"repeat_threshold": 5, "skip_footnotes": False}})
+    assert cf.repeat_threshold == 5
+    assert cf.skip_footnotes is False
+
+
+def _body_lines(page: int, n: int) -> list[str]:
+    return [f"Sentence {i} on page {page} of the running body text." for i in range(n)]
+
+
+def test_filter_text_drops_page_numbers_footnotes_and_running_headers():
+    lines = ["Preface material", "Chapter 1"]
+    for page in range(1, 13):
+        lines += ["My Book Title", *_body_lines(page, 3), f"Claim{page}[12] in prose.", str(page)]
+    lines += ["1. A short footnote line.", "Page 7 of 9"]
+
+    out = ContentFilter({}).filter_text("\n".join(lines))
+
+    assert out.startswith("Chapter 1")
+    assert "Preface material" not in out
+    assert "My Book Title" not in out
+    assert "Claim3 in prose." in out
+    assert "[12]" not in out
+    assert "A short footnote line" not in out
+    assert "Page 7" not in out
+    assert "\n3\n" not in out
+
+
+def test_filter_text_respects_disabled_steps():
+    text = "Chapter 1\nBody[3] text.\n42\n1. Note."
+    cf = ContentFilter({"skip_page_numbers": False, "skip_footnotes": False})
+    assert cf.filter_text(text) == text
+
+
+def test_filter_text_keeps_repeats_in_short_texts():
+    text = "Chapter 1\n" + "\n".join(["Yes."] * 5)
+    assert ContentFilter({}).filter_text(text).count("Yes.") == 5
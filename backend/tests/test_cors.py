@@ -0,0 +1,18 @@
+"""Tests for the localhost-only CORS policy."""
+from fastapi.testclient import TestClient
+
+from backend.main import app
+
+client = TestClient(app)
+
+
+def test_cors_allows_localhost_origins_with_any_port():
+    for origin in ("http://localhost:3000", "http://127.0.0.1:5000", "http://localhost"):
+        res = client.get("/", headers={"Origin": origin})
+        assert res.headers.get("access-control-allow-origin") == origin
+
+
+def test_cors_rejects_other_origins():
+    for origin in ("http://example.com", "http://localhost.evil.com", "http://127.0.0.1:80.evil.com"):
+        res = client.get("/", headers={"Origin": origin})
+        assert "access-control-allow-origin" not in res.headers
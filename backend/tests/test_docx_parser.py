@@ -0,0 +1,54 @@
+"""Tests for DOCX parsing via python-docx."""
+import pytest
+
+docx = pytest.importorskip("docx")
+
+from backend.parsers.docx_parser import DOCXParser
+
+
+def test_docx_parser_reads_body_paragraphs_and_author(tmp_path):
+    doc = docx.Document()
+    doc.core_properties.author = "Ann Writer"
+    doc.add_paragraph("The Sample Document")
+    doc.add_paragraph("Chapter 1")
+    doc.add_paragraph("")
+    doc.add_paragraph("First sentence here. Second one! 第三。")
+    doc.sections[0].header.paragraphs[0].text = "Running header"
+    path = tmp_path / "sample.docx"
+    doc.save(path)
+
+    parsed = DOCXParser().parse_file(str(path))
+
+    assert parsed["author"] == "Ann Writer"
+    assert parsed["title"] == "The Sample Document"
+    assert parsed["content"] == ["Chapter 1\nFirst sentence here.", "Second one!", "第三。"]
+    assert not any("Running header" in s for s in parsed["content"])
+
+
+def test_docx_parser_includes_table_cells_in_document_order(tmp_path):
+    doc = docx.Document()
+    doc.add_paragraph("Chapter 1")
+    doc.add_paragraph("Before the table.")
+    table = doc.add_table(rows=1, cols=2)
+    table.cell(0, 0).text = "Table cell text that matters."
+    table.cell(0, 1).text = "Second cell."
+    doc.add_paragraph("After the table.")
+    path = tmp_path / "table.docx"
+    doc.save(path)
+
+    parsed = DOCXParser().parse_file(str(path))
+
+    assert parsed["content"] == [
+        "Chapter 1\nBefore the table.",
+        "Table cell text that matters.",
+        "Second cell.",
+        "After the table.",
+    ]
+
+
+def test_docx_parser_rejects_empty_document(tmp_path):
+    path = tmp_path / "empty.docx"
+    docx.Document().save(path)
+
+    with pytest.raises(Exception, match="No text content"):
+        DOCXParser().parse_file(str(path))
@@ -0,0 +1,36 @@
+"""Tests for EPUB parsing."""
+import pytest
+
+epub = pytest.importorskip("ebooklib.epub")
+
+from backend.parsers.epub_parser import EPUBParser
+
+
+def _write_epub(path):
+    book = epub.EpubBook()
+    book.set_identifier("test-book")
+    book.set_title("My Test Book")
+    book.set_language("en")
+    book.add_author("Jane Roe")
+    chapter = epub.EpubHtml(title="One", file_name="c1.xhtml", lang="en")
+    chapter.content = (
+        "<html><head><style>p { color: red }</style><script>var hidden = 1;</script></head>"
+        "<body><h1>Chapter 1</h1><p>First sentence here. Second one!</p><p>Third &amp; last?</p></body></html>"
+    )
+    book.add_item(chapter)
+    book.add_item(epub.EpubNcx())
+    book.toc = (chapter,)
+    book.spine = [chapter]
+    epub.write_epub(str(path), book)
+
+
+def test_epub_parser_extracts_text_without_script_or_style(tmp_path):
+    path = tmp_path / "book.epub"
+    _write_epub(path)
+
+    parsed = EPUBParser().parse_file(str(path))
+
+    assert parsed["title"] == "My Test Book"
+    assert parsed["author"] == "Jane Roe"
+    assert parsed["content"] == ["Chapter 1\nFirst sentence here.", "Second one!", "Third & last?"]
+    assert not any("hidden" in s or "color" in s for s in parsed["content"])
@@ -0,0 +1,212 @@
+"""Tests for the Google Cloud TTS wrapper, using a stand-in client library."""
+import types
+
+import pytest
+
+from backend.tts import google_tts
+from backend.tts.google_tts import GoogleTTSService
+
+
+class FakeClient:
+    def __init__(self):
+        self.requests = []
+
+    def synthesize_speech(self, *, input, voice, audio_config):
+        self.requests.append((input, voice, audio_config))
+        return types.SimpleNamespace(audio_content=f"audio:{input.get('text') or input['ssml']}".encode())
+
+
+@pytest.fixture
+def fake_texttospeech(monkeypatch):
+    """Stand in a minimal google.cloud.texttospeech module."""
+    module = types.ModuleType("google.cloud.texttospeech")
+    module.SynthesisInput = lambda **kw: kw
+    module.VoiceSelectionParams = lambda **kw: kw
+    module.AudioConfig = lambda **kw: kw
+    module.AudioEncoding = types.SimpleNamespace(MP3="MP3", LINEAR16="LINEAR16", OGG_OPUS="OGG_OPUS")
+    module.TextToSpeechClient = FakeClient
+    monkeypatch.setattr(google_tts, "texttospeech", module)
+    return module
+
+
+def test_disk_cache_skips_repeat_api_calls(tmp_path, fake_texttospeech):
+    service = GoogleTTSService(cache_dir=tmp_path / "tts")
+    client = service._get_client()
+
+    first = service.synthesize_to_file(text="Hello there.", output_path=tmp_path / "a.mp3")
+    second = service.synthesize_to_file(text="Hello there.", output_path=tmp_path / "b.wav")
+
+    assert len(client.requests) == 1
+    assert second == tmp_path / "b.mp3"
+    assert first.read_bytes() == second.read_bytes() == b"audio:Hello there."
+
+    service.synthesize_to_file(text="Hello there.", output_path=tmp_path / "c.mp3", pitch=2.0)
+    assert len(client.requests) == 2
+
+
+def test_cache_key_covers_pitch_and_encoding():
+    base = GoogleTTSService.get_cache_key("text", "en-US-Neural2-D", 1.0)
+    assert base != GoogleTTSService.get_cache_key("text", "en-US-Neural2-D", 1.0, pitch=1.0)
+    assert base != GoogleTTSService.get_cache_key("text", "en-US-Neural2-D", 1.0, encoding="LINEAR16")
+
+
+def test_memory_cache_serves_hits_and_evicts_by_size(tmp_path, fake_texttospeech):
+    service = GoogleTTSService(max_cache_bytes=40)
+    client = service._get_client()
+
+    service.synthesize_to_file(text="one", output_path=tmp_path / "1.mp3")
+    service.synthesize_to_file(text="two", output_path=tmp_path / "2.mp3")
+    out = service.synthesize_to_file(text="one", output_path=tmp_path / "3.mp3")
+    assert len(client.requests) == 2
+    assert out.read_bytes() == b"audio:one"
+
+    # Clips of 9 + 9 + 11 + 12 bytes overflow the 40-byte budget, so the
+    # least recently used one ("two"; "one" was just hit) is evicted
+    service.synthesize_to_file(text="three", output_path=tmp_path / "4.mp3")
+    service.synthesize_to_file(text="fourth", output_path=tmp_path / "5.mp3")
+    assert service._mem_bytes == 32
+    assert list(service._mem_cache) == [
+        GoogleTTSService.get_cache_key(t, service.default_voice, 1.0, 0.0, "MP3")
+        for t in ("one", "three", "fourth")
+    ]
+
+
+def test_concurrent_first_calls_share_one_client(fake_texttospeech, monkeypatch):
+    import threading
+    import time
+
+    created = []
+
+    class SlowClient(FakeClient):
+        def __init__(self):
+            time.sleep(0.05)
+            super().__init__()
+            created.append(self)
+
+    monkeypatch.setattr(fake_texttospeech, "TextToSpeechClient", SlowClient)
+    service = GoogleTTSService()
+    clients = []
+    threads = [threading.Thread(target=lambda: clients.append(service._get_client())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 1
+    assert all(client is created[0] for client in clients)
+
+
+def test_missing_client_library_is_reported(monkeypatch):
+    monkeypatch.setattr(google_tts, "texttospeech", None)
+    with pytest.raises(RuntimeError, match="google-cloud-texttospeech"):
+        GoogleTTSService()._get_client()
+
+
+def test_encoding_and_extension_resolved_at_construction(tmp_path, fake_texttospeech):
+    service = GoogleTTSService(audio_encoding="LINEAR16")
+    client = service._get_client()
+
+    out = service.synthesize_to_file(text="Hi", output_path=tmp_path / "clip.mp3")
+    assert out.suffix == ".wav"
+    assert client.requests[0][2]["audio_encoding"] == "LINEAR16"
+
+    fallback = GoogleTTSService(audio_encoding="FLAC")
+    assert (fallback._audio_ext, fallback._encoding) == (".mp3", "MP3")
+
+
+def test_ssml_detected_after_leading_whitespace(tmp_path, fake_texttospeech):
+    service = GoogleTTSService()
+    client = service._get_client()
+
+    service.synthesize_to_file(text="\n  <speak>Hi</speak>", output_path=tmp_path / "a.mp3")
+    service.synthesize_to_file(text="Say <speak>", output_path=tmp_path / "b.mp3")
+    assert "ssml" in client.requests[0][0]
+    assert client.requests[1][0] == {"text": "Say <speak>"}
+
+    with pytest.raises(ValueError):
+        service.synthesize_to_file(text=" \t\n", output_path=tmp_path / "c.mp3")
+
+
+def test_language_code_derived_from_voice_name(tmp_path, fake_texttospeech):
+    service = GoogleTTSService()
+    client = service._get_client()
+
+    service.synthesize_to_file(text="Hola", output_path=tmp_path / "a.mp3", speaker="es-ES-Neural2-A")
+    service.synthesize_to_file(text="Hi", output_path=tmp_path / "b.mp3", speaker="custom")
+    service.synthesize_to_file(text="Hey", output_path=tmp_path / "c.mp3", language="en-GB")
+    assert [req[1]["language_code"] for req in client.requests] == ["es-ES", "en-US", "en-GB"]
+
+
+def test_concurrent_identical_misses_make_one_api_call(tmp_path, fake_texttospeech, monkeypatch):
+    import threading
+    import time
+
+    class SlowClient(FakeClient):
+        def synthesize_speech(self, **kwargs):
+            time.sleep(0.05)
+            return super().synthesize_speech(**kwargs)
+
+    monkeypatch.setattr(fake_texttospeech, "TextToSpeechClient", SlowClient)
+    service = GoogleTTSService(cache_dir=tmp_path / "tts")
+    client = service._get_client()
+
+    def synthesize(n):
+        service.synthesize_to_file(text="Same phrase.", output_path=tmp_path / f"{n}.mp3")
+
+    threads = [threading.Thread(target=synthesize, args=(n,)) for n in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(client.requests) == 1
+    assert {(tmp_path / f"{n}.mp3").read_bytes() for n in range(5)} == {b"audio:Same phrase."}
+    assert service._inflight == {}
+
+
+def test_disk_cache_outputs_are_hard_links(tmp_path, fake_texttospeech):
+    cache_dir = tmp_path / "tts"
+    service = GoogleTTSService(cache_dir=cache_dir, max_cache_bytes=0)
+    service._get_client()
+
+    first = service.synthesize_to_file(text="Linked.", output_path=tmp_path / "a.mp3")
+    second = service.synthesize_to_file(text="Linked.", output_path=tmp_path / "b.mp3")
+    (entry,) = cache_dir.iterdir()
+    assert first.stat().st_ino == second.stat().st_ino == entry.stat().st_ino
+    assert second.read_bytes() == b"audio:Linked."
+
+
+def test_cache_key_matches_sha256_of_joined_fields():
+    import hashlib
+
+    expected = hashlib.sha256("Hello:en-US-Neural2-D:1.0:0.0:MP3".encode()).hexdigest()[:16]
+    assert GoogleTTSService.get_cache_key("Hello", "en-US-Neural2-D", 1.0) == expected
+
+
+@pytest.mark.parametrize("tmpfile_flag", [google_tts._O_TMPFILE, 0])
+def test_store_in_cache_leaves_only_the_entry(tmp_path, monkeypatch, tmpfile_flag):
+    monkeypatch.setattr(google_tts, "_O_TMPFILE", tmpfile_flag)
+    entry = tmp_path / "tts" / "abc.mp3"
+
+    assert GoogleTTSService._store_in_cache(entry, b"clip")
+    assert GoogleTTSService._store_in_cache(entry, b"clip")
+    assert entry.read_bytes() == b"clip"
+    assert [p.name for p in entry.parent.iterdir()] == ["abc.mp3"]
+
+
+@pytest.mark.parametrize("max_cache_bytes", [0, 1024])
+def test_reused_output_path_leaves_cache_entries_intact(tmp_path, fake_texttospeech, max_cache_bytes):
+    cache_dir = tmp_path / "tts"
+    service = GoogleTTSService(cache_dir=cache_dir, max_cache_bytes=max_cache_bytes)
+    service._get_client()
+    out = tmp_path / "clip.mp3"
+
+    service.synthesize_to_file(text="first", output_path=out)
+    service.synthesize_to_file(text="second", output_path=out)
+    assert out.read_bytes() == b"audio:second"
+    # Served from the cache again, onto the same path
+    service.synthesize_to_file(text="first", output_path=out)
+    assert out.read_bytes() == b"audio:first"
+
+    assert sorted(p.read_bytes() for p in cache_dir.iterdir()) == [b"audio:first", b"audio:second"]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["clip.mp3", "tts"]
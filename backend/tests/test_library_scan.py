@@ -1,6 +1,10 @@
+import hashlib
+import os
+import time
 from pathlib import Path
 
-from backend.library import scan_library
+import backend.library as library
+from backend.library import find_book, scan_library
 
 
 def test_scan_library_filters_and_sorts(tmp_path: Path):
@@ -13,3 +17,72 @@ def test_scan_library_filters_and_sorts(tmp_path: Path):
 
     assert names == ["A", "b"]
     assert all(item["ext"] in (".pdf", ".epub") for item in results)
+
+
+def test_scan_library_recurses_and_keeps_path_based_ids(tmp_path: Path):
+    nested = tmp_path / "series" / "vol1"
+    nested.mkdir(parents=True)
+    book = nested / "Deep.PDF"
+    book.write_text("x", encoding="utf-8")
+
+    results = scan_library(tmp_path)
+
+    assert len(results) == 1
+    item = results[0]
+    assert item["path"] == str(book)
+    assert item["ext"] == ".pdf"
+    assert item["id"] == hashlib.sha1(str(book).encode("utf-8")).hexdigest()
+
+
+def test_scan_library_picks_up_nested_changes_and_indexes_ids(tmp_path: Path):
+    nested = tmp_path / "series"
+    nested.mkdir()
+    (nested / "One.pdf").write_text("x", encoding="utf-8")
+    first = scan_library(tmp_path)
+    assert [item["title"] for item in first] == ["One"]
+    assert find_book(tmp_path, first[0]["id"])["path"] == first[0]["path"]
+
+    # Only the nested directory's mtime changes, so its listing is read again.
+    added = nested / "Two.epub"
+    added.write_text("x", encoding="utf-8")
+    assert [item["title"] for item in scan_library(tmp_path)] == ["One", "Two"]
+    assert find_book(tmp_path, hashlib.sha1(str(added).encode("utf-8")).hexdigest()) is not None
+
+    added.unlink()
+    assert [item["title"] for item in scan_library(tmp_path)] == ["One"]
+    assert find_book(tmp_path, "missing") is None
+
+
+def test_scan_pool_is_shared_and_skipped_for_lone_directories(tmp_path: Path, monkeypatch):
+    monkeypatch.setattr(library, "_SCAN_POOL", None)
+    (tmp_path / "Flat.pdf").write_text("x", encoding="utf-8")
+    scan_library(tmp_path)
+    assert library._SCAN_POOL is None
+
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+    scan_library(tmp_path)
+    pool = library._SCAN_POOL
+    assert pool is not None
+    scan_library(tmp_path)
+    assert library._SCAN_POOL is pool
+    pool.shutdown()
+
+
+def test_scan_library_relists_directories_with_racy_mtimes(tmp_path: Path):
+    """An entry added within the filesystem's mtime granularity is still found."""
+    (tmp_path / "One.pdf").write_text("x", encoding="utf-8")
+    tick = time.time_ns()
+    os.utime(tmp_path, ns=(tick, tick))
+    assert [item["title"] for item in scan_library(tmp_path)] == ["One"]
+
+    # A coarse clock leaves the directory mtime unchanged after the addition.
+    (tmp_path / "Two.pdf").write_text("x", encoding="utf-8")
+    os.utime(tmp_path, ns=(tick, tick))
+    assert [item["title"] for item in scan_library(tmp_path)] == ["One", "Two"]
+
+    # Once the mtime is old enough, the listing is cached and reused.
+    old = tick - 10_000_000_000
+    os.utime(tmp_path, ns=(old, old))
+    scan_library(tmp_path)
+    assert library._DIR_CACHE[str(tmp_path)][0] == old
@@ -23,3 +23,16 @@ def test_update_library_path_persists(tmp_path: Path):
     assert payload["library_path"] == str(library_dir)
     assert payload["items"][0]["title"] == "Sample"
     assert f'library_path: "{library_dir}"' in settings_path.read_text(encoding="utf-8")
+
+
+def test_set_library_path_rewrites_or_inserts_line(tmp_path: Path, monkeypatch):
+    settings_path = tmp_path / "settings.yaml"
+    monkeypatch.setattr(main, "CONFIG_PATH", settings_path)
+
+    settings_path.write_text('voice: a\nlibrary_path: "/old"\nspeed: 1\n', encoding="utf-8")
+    main._set_library_path_in_config(r"C:\Books\new")
+    assert settings_path.read_text(encoding="utf-8") == 'voice: a\nlibrary_path: "C:\\Books\\new"\nspeed: 1\n'
+
+    settings_path.write_text("voice: a\n# Library Settings\n\nspeed: 1\n", encoding="utf-8")
+    main._set_library_path_in_config("/books")
+    assert settings_path.read_text(encoding="utf-8") == 'voice: a\n# Library Settings\nlibrary_path: "/books"\nspeed: 1\n'
@@ -1,4 +1,8 @@
 """Tests for position-aware PDF block extraction."""
+import contextlib
+import sys
+from types import SimpleNamespace
+
 import pytest
 from backend.parsers.pdf_blocks import PDFBlockExtractor, TextBlock
 
@@ -10,42 +14,6 @@ def test_block_extractor_returns_blocks_with_coordinates():
     assert hasattr(extractor, 'extract_blocks')
 
 
-def test_classify_header_zone():
-    """Text in top 10% should be classified as header."""
-    extractor = PDFBlockExtractor(header_zone_percent=0.10)
-    block = TextBlock(
-        text="Chapter Title",
-        x0=100, y0=50, x1=400, y1=70,  # Near top
-        page_height=800,
-        font_size=14
-    )
-    assert extractor.classify_zone(block) == "header"
-
-
-def test_classify_footer_zone():
-    """Text in bottom 10% should be classified as footer."""
-    extractor = PDFBlockExtractor(footer_zone_percent=0.10)
-    block = TextBlock(
-        text="Page 42",
-        x0=350, y0=750, x1=400, y1=770,  # Near bottom
-        page_height=800,
-        font_size=10
-    )
-    assert extractor.classify_zone(block) == "footer"
-
-
-def test_classify_body_zone():
-    """Text in middle should be classified as body."""
-    extractor = PDFBlockExtractor()
-    block = TextBlock(
-        text="Regular paragraph text here.",
-        x0=100, y0=400, x1=500, y1=420,  # Middle
-        page_height=800,
-        font_size=12
-    )
-    assert extractor.classify_zone(block) == "body"
-
-
 def test_detect_repeated_headers():
     """Text appearing at same Y position across multiple pages = header."""
     extractor = PDFBlockExtractor()
@@ -58,3 +26,84 @@ def test_detect_repeated_headers():
     repeated = extractor.find_repeated_headers(blocks, threshold=3)
     assert "book title" in repeated  # Normalized lowercase
     assert "unique content" not in repeated
+
+
+def test_normalized_text_is_cached_without_affecting_equality():
+    block = TextBlock(text="  Book \n  TITLE ", x0=0, y0=0, x1=1, y1=1, page_height=800)
+    assert block.normalized == "book title"
+    assert block == TextBlock(text="  Book \n  TITLE ", x0=0, y0=0, x1=1, y1=1, page_height=800)
+
+
+class FakePage:
+    def __init__(self, blocks, height=800):
+        self.rect = SimpleNamespace(height=height)
+        self._blocks = blocks
+
+    def get_text(self, mode, flags=0):
+        return self._blocks
+
+
+class FakeDocument(list):
+    def __init__(self, pages, metadata=None):
+        super().__init__(pages)
+        self.metadata = metadata
+
+
+def _install_fake_fitz(monkeypatch, pages, metadata=None):
+    """Serve the given pages from fitz.open() in PyMuPDF "blocks" form."""
+    doc = FakeDocument(pages, metadata)
+    fake_fitz = SimpleNamespace(
+        TEXT_PRESERVE_WHITESPACE=0,
+        open=lambda path: contextlib.nullcontext(doc),
+    )
+    monkeypatch.setitem(sys.modules, "fitz", fake_fitz)
+
+
+def test_extract_blocks_skips_images_and_blank_text(monkeypatch):
+    """Each page yields one flattened TextBlock per non-empty text block."""
+    page_blocks = [
+        (10, 100, 200, 120, "First line\nsecond line\n", 0, 0),
+        (10, 300, 200, 320, "   \n", 1, 0),
+        (10, 400, 200, 600, "<image>", 2, 1),
+    ]
+    _install_fake_fitz(monkeypatch, [FakePage(page_blocks), FakePage(page_blocks)], {"title": "T"})
+
+    blocks, page_count, metadata = PDFBlockExtractor().extract_blocks("/fake/path.pdf")
+    assert page_count == 2
+    assert metadata == {"title": "T"}
+    assert [(b.text, b.page_num, b.page_height) for b in blocks] == [
+        ("First line second line", 0, 800),
+        ("First line second line", 1, 800),
+    ]
+
+
+def test_extract_body_blocks_drops_header_and_footer_zones(monkeypatch):
+    """Blocks starting in the top or bottom 10% of the page are skipped."""
+    page_blocks = [
+        (0, y0, 10, y0 + 10, f"Block {y0}", n, 0)
+        for n, y0 in enumerate((0, 79.9, 80, 400, 720, 720.1, 790))
+    ]
+    _install_fake_fitz(monkeypatch, [FakePage(page_blocks)])
+    extractor = PDFBlockExtractor(header_zone_percent=0.10, footer_zone_percent=0.10)
+
+    all_blocks, _, _ = extractor.extract_blocks("/fake/path.pdf")
+    body, page_count, metadata = extractor.extract_body_blocks("/fake/path.pdf")
+    assert page_count == 1
+    assert metadata == {}
+    assert len(all_blocks) == 7
+    assert [block.y0 for block in body] == [80, 400, 720]
+
+
+def test_extractor_reads_pdf_config_until_it_changes(tmp_path, monkeypatch):
+    """Zone settings come from the cached settings file and track edits."""
+    import os
+    from backend.parsers import pdf_blocks
+
+    settings_path = tmp_path / "settings.yaml"
+    settings_path.write_text("pdf_filtering:\n  header_zone_percent: 0.2\n", encoding="utf-8")
+    monkeypatch.setattr(pdf_blocks, "CONFIG_PATH", settings_path)
+    assert PDFBlockExtractor().header_zone_percent == 0.2
+
+    settings_path.write_text("pdf_filtering:\n  header_zone_percent: 0.25\n", encoding="utf-8")
+    os.utime(settings_path, ns=(0, 1))
+    assert PDFBlockExtractor().header_zone_percent == 0.25
@@ -11,6 +11,37 @@ from backend.parsers.pdf_parser import PDFParser
 from backend.parsers.pdf_blocks import TextBlock
 
 
+class _FakePage:
+    def __init__(self, height, blocks):
+        self.rect = MagicMock(height=height)
+        self._blocks = blocks
+
+    def get_text(self, mode, flags=0):
+        return [
+            (b.x0, b.y0, b.x1, b.y1, b.text, i, 0)
+            for i, b in enumerate(self._blocks)
+        ]
+
+
+class _FakeDocument(list):
+    """Pages plus the Info dictionary PyMuPDF exposes as Document.metadata."""
+
+    def __init__(self, pages, metadata=None):
+        super().__init__(pages)
+        self.metadata = metadata
+
+
+def _fake_document(blocks, page_count, metadata=None):
+    """A document serving the given TextBlocks in PyMuPDF "blocks" form."""
+    return _FakeDocument(
+        [
+            _FakePage(blocks[0].page_height, [b for b in blocks if b.page_num == n])
+            for n in range(page_count)
+        ],
+        metadata,
+    )
+
+
 def test_parser_uses_position_filtering():
     """Parser should filter out header/footer zones."""
     parser = PDFParser()
@@ -82,16 +113,18 @@ def test_position_filtering_excludes_header_and_footer_zones():
 
     parser = PDFParser(use_position_filtering=True)
 
-    # Mock the block extractor to return our test blocks
-    with patch.object(
-        parser.block_extractor,
-        'extract_blocks',
-        return_value=(test_blocks, 5)  # 5 pages
-    ):
-        text, page_count = parser._extract_with_position_filtering("/fake/path.pdf")
+    # Serve the test blocks from a fake 5-page document so the zone check
+    # inside extraction is exercised
+    with patch.object(mock_fitz, 'open') as mock_open:
+        mock_open.return_value.__enter__.return_value = _fake_document(
+            test_blocks, 5, {"title": "Info Title"}
+        )
+        text, page_count, metadata = parser._extract_with_position_filtering("/fake/path.pdf")
 
-    # Verify page count is passed through
+    # Verify page count and metadata come from the single open document
+    assert mock_open.call_count == 1
     assert page_count == 5
+    assert metadata == {"title": "Info Title"}
 
     # Verify header content was filtered out
     assert "Running Header" not in text
@@ -169,9 +202,9 @@ def test_position_filtering_excludes_repeated_text():
     with patch.object(
         parser.block_extractor,
         'extract_blocks',
-        return_value=(test_blocks, 3)
+        return_value=(test_blocks, 3, {})
     ):
-        text, page_count = parser._extract_with_position_filtering("/fake/path.pdf")
+        text, page_count, _ = parser._extract_with_position_filtering("/fake/path.pdf")
 
     # Repeated text should be filtered out (appears on 3 pages = threshold)
     assert "My Book Title" not in text
@@ -180,3 +213,32 @@ def test_position_filtering_excludes_repeated_text():
     assert "First chapter content" in text
     assert "Second chapter content" in text
     assert "Third chapter content" in text
+
+
+def test_extract_title_only_considers_leading_lines():
+    """Title comes from the first 10 lines, else the file name stem."""
+    parser = PDFParser()
+    lead = "\n".join(["x"] * 10)
+    assert parser._extract_title("/books/My Book.pdf", "A Proper Book Title\nbody") == "A Proper Book Title"
+    assert parser._extract_title("/books/My Book.pdf", lead + "\nA Proper Book Title") == "My Book"
+
+
+def test_clean_metadata_keeps_only_non_empty_title_and_author():
+    """Blank or missing Info entries fall back to the text heuristics."""
+    metadata = {"title": " Real Title ", "author": "", "producer": "LaTeX"}
+    assert PDFParser._clean_metadata(metadata) == {"title": "Real Title"}
+    assert PDFParser._clean_metadata({}) == {}
+
+
+def test_parse_file_opens_the_pdf_once(monkeypatch):
+    """Title and author come from the document opened for text extraction."""
+    parser = PDFParser(use_position_filtering=False)
+    page = MagicMock()
+    page.get_text.return_value = "Chapter 1\nBody text."
+    doc = _FakeDocument([page], {"title": "Info Title", "author": "Info Author"})
+    with patch.object(mock_fitz, 'open') as mock_open:
+        mock_open.return_value.__enter__.return_value = doc
+        result = parser.parse_file("/fake/path.pdf")
+
+    assert mock_open.call_count == 1
+    assert (result["title"], result["author"]) == ("Info Title", "Info Author")
@@ -0,0 +1,37 @@
+"""Tests for Phase 6 adaptive playback speed."""
+from datetime import datetime, timedelta, timezone
+
+from fastapi.testclient import TestClient
+
+import backend.main as main
+
+
+def test_adaptive_speed_uses_monotonic_session_clock(monkeypatch):
+    monkeypatch.setattr(main, "_SESSION_START_MONOTONIC", 1000.0)
+    monkeypatch.setattr(main.time, "monotonic", lambda: 1000.0 + 2 * 60 * main.INCREMENT_INTERVAL_MIN + 1)
+    ps = main.PlaybackState(id=1, session_start=datetime.now(timezone.utc))
+
+    expected = min(main.MAX_SPEED, main.START_SPEED + 2 * main.SPEED_INCREMENT)
+    assert main._compute_adaptive_speed(ps) == expected
+
+
+def test_adaptive_speed_falls_back_to_naive_persisted_start(monkeypatch):
+    monkeypatch.setattr(main, "_SESSION_START_MONOTONIC", None)
+    started = datetime.now(timezone.utc) - timedelta(minutes=main.INCREMENT_INTERVAL_MIN + 1)
+    ps = main.PlaybackState(id=1, session_start=started.replace(tzinfo=None))
+
+    expected = min(main.MAX_SPEED, main.START_SPEED + main.SPEED_INCREMENT)
+    assert main._compute_adaptive_speed(ps) == expected
+
+
+def test_playback_update_clamps_and_keeps_untouched_fields(temp_db):
+    client = TestClient(main.app)
+
+    res = client.post("/api/playback/update", json={"position_seconds": -5, "speed": 9})
+    assert res.status_code == 200
+    assert res.json()["position_seconds"] == 0.0
+    assert res.json()["speed"] == 3.0
+
+    res = client.post("/api/playback/update", json={"position_seconds": 12.5})
+    assert res.json()["position_seconds"] == 12.5
+    assert res.json()["speed"] == 3.0
@@ -5,11 +5,61 @@ Provides synthesis using Google Cloud TTS API with caching support.
 """
 from __future__ import annotations
 
+import contextlib
 import hashlib
 import os
+import re
+import shutil
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Optional
 
+try:
+    from google.cloud import texttospeech
+except ImportError:  # reported when a client is first needed
+    texttospeech = None
+
+# Supported audio encodings and the file extension each is written with
+_AUDIO_EXTENSIONS = {"MP3": ".mp3", "LINEAR16": ".wav", "OGG_OPUS": ".ogg"}
+_LEADING_WS_RE = re.compile(r"\s*")
+
+
+# Linux only: an unnamed file in the cache directory that is linked into place
+# once fully written, so a crash mid-write leaves no stray temp file behind.
+_O_TMPFILE = getattr(os, "O_TMPFILE", 0)
+
+
+def _store_anonymous(cache_file: Path, audio: bytes) -> Optional[bool]:
+    """Store a cache entry via O_TMPFILE; None if the filesystem can't."""
+    try:
+        fd = os.open(cache_file.parent, _O_TMPFILE | os.O_WRONLY, 0o644)
+    except OSError:
+        return None  # e.g. EOPNOTSUPP on filesystems without O_TMPFILE
+    try:
+        with open(fd, "wb") as fh:
+            fh.write(audio)
+            fh.flush()
+            os.link(f"/proc/self/fd/{fd}", cache_file)
+        return True
+    except FileExistsError:
+        return True  # a concurrent writer stored the same clip first
+    except OSError:
+        return None
+
+
+def _tmp_sibling(path: Path) -> Path:
+    """Temporary name next to path, unique per process and thread."""
+    return path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+
+
+@lru_cache(maxsize=64)
+def _language_code(voice_name: str) -> str:
+    """Language code from a voice name: "en-US-Neural2-D" -> "en-US"."""
+    parts = voice_name.split("-")
+    return "-".join(parts[:2]) if len(parts) >= 2 else "en-US"
+
 
 class GoogleTTSService:
     """Manage Google Cloud TTS synthesis."""
@@ -21,28 +71,53 @@ class GoogleTTSService:
         default_speaking_rate: float = 1.0,
         default_pitch: float = 0.0,
         audio_encoding: str = "MP3",
+        cache_dir: Optional[Path] = None,
+        max_cache_bytes: int = 10 * 1024 * 1024,
     ) -> None:
         self.default_voice = default_voice
         self.default_speaking_rate = default_speaking_rate
         self.default_pitch = default_pitch
         self.audio_encoding = audio_encoding
+        # Resolved once per service; unknown encodings fall back to MP3
+        encoding_name = audio_encoding if audio_encoding in _AUDIO_EXTENSIONS else "MP3"
+        self._audio_ext = _AUDIO_EXTENSIONS[encoding_name]
+        self._encoding = getattr(texttospeech.AudioEncoding, encoding_name) if texttospeech is not None else None
+        # Synthesized audio is kept here by content key so repeated requests
+        # skip the API round-trip; None disables the cache.
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        # Recently used clips are also held in memory (LRU, bounded by total
+        # size) so phrases that repeat constantly never touch the disk.
+        self.max_cache_bytes = max_cache_bytes
+        self._mem_cache: "OrderedDict[str, bytes]" = OrderedDict()
+        self._mem_bytes = 0
+        self._mem_lock = threading.Lock()
         self._client = None
+        self._client_lock = threading.Lock()
+        # Cache keys currently being synthesized -> event set when they land
+        self._inflight: dict[str, threading.Event] = {}
+        self._inflight_lock = threading.Lock()
 
     def _get_client(self):
-        """Lazy-load the Google TTS client."""
-        if self._client is not None:
-            return self._client
+        """Lazy-load the Google TTS client.
 
-        try:
-            from google.cloud import texttospeech
-        except ImportError as exc:
-            raise RuntimeError(
-                "google-cloud-texttospeech is not installed. "
-                "Run `pip install google-cloud-texttospeech`."
-            ) from exc
+        Synthesis runs on executor threads, so creation is double-checked under
+        a lock: concurrent first calls share one client (one gRPC channel and
+        one credential fetch) instead of each building their own.
+        """
+        client = self._client
+        if client is not None:
+            return client
+
+        with self._client_lock:
+            if self._client is None:
+                if texttospeech is None:
+                    raise RuntimeError(
+                        "google-cloud-texttospeech is not installed. "
+                        "Run `pip install google-cloud-texttospeech`."
+                    )
 
-        self._client = texttospeech.TextToSpeechClient()
-        return self._client
+                self._client = texttospeech.TextToSpeechClient()
+            return self._client
 
     def synthesize_to_file(
         self,
@@ -69,27 +144,82 @@ class GoogleTTSService:
         Returns:
             Path to the generated audio file.
         """
-        if not text.strip():
+        # Locate the first non-space character instead of stripping a copy of
+        # what may be a whole paragraph; it serves both checks below.
+        start = _LEADING_WS_RE.match(text).end()
+        if start == len(text):
             raise ValueError("Text is empty.")
 
-        from google.cloud import texttospeech
-
-        client = self._get_client()
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
         # Determine voice name
         voice_name = speaker or self.default_voice
+        rate = speaking_rate or self.default_speaking_rate
+        pitch = pitch or self.default_pitch
 
-        # Extract language code from voice name if not provided
-        # Voice names follow pattern: "en-US-Neural2-D" -> language_code = "en-US"
-        if language:
-            language_code = language
-        else:
-            parts = voice_name.split("-")
-            language_code = "-".join(parts[:2]) if len(parts) >= 2 else "en-US"
+        # Adjust extension based on encoding
+        expected_ext = self._audio_ext
+
+        # If output_path has different extension, adjust it
+        if output_path.suffix.lower() != expected_ext:
+            output_path = output_path.with_suffix(expected_ext)
+
+        key = cache_file = None
+        owns_flight = False
+        if self.cache_dir is not None or self.max_cache_bytes > 0:
+            key = self.get_cache_key(text, voice_name, rate, pitch, self.audio_encoding)
+            if self.cache_dir is not None:
+                cache_file = self.cache_dir / f"{key}{expected_ext}"
+            if self._serve_cached(key, cache_file, output_path):
+                return output_path
+
+            # Singleflight: the first caller to miss synthesizes the clip while
+            # concurrent requests for the same key wait and read it from the cache.
+            with self._inflight_lock:
+                pending = self._inflight.get(key)
+                if pending is None:
+                    self._inflight[key] = threading.Event()
+                    owns_flight = True
+            if pending is not None:
+                pending.wait()
+                if self._serve_cached(key, cache_file, output_path):
+                    return output_path
+                # The first caller failed, or the clip fit neither cache
+
+        try:
+            audio = self._request_audio(text, start, voice_name, language, rate, pitch)
+
+            if key is not None:
+                self._mem_put(key, audio)
+            # Write audio content to file, as a link to the new cache entry
+            # when there is one
+            stored = cache_file is not None and self._store_in_cache(cache_file, audio)
+            if not (stored and self._link_or_copy(cache_file, output_path)):
+                self._write_output(output_path, audio)
+        finally:
+            if owns_flight:
+                with self._inflight_lock:
+                    self._inflight.pop(key).set()
+        return output_path
+
+    def _request_audio(
+        self,
+        text: str,
+        start: int,
+        voice_name: str,
+        language: Optional[str],
+        rate: float,
+        pitch: float,
+    ) -> bytes:
+        """Call the API; start is the index of the text's first non-space character."""
+        client = self._get_client()
+
+        # Extract language code from voice name if not provided; the handful
+        # of voice names in use are parsed once each
+        language_code = language or _language_code(voice_name)
 
         # Detect SSML vs plain text
-        if text.strip().startswith("<speak>"):
+        if text.startswith("<speak>", start):
             synthesis_input = texttospeech.SynthesisInput(ssml=text)
         else:
             synthesis_input = texttospeech.SynthesisInput(text=text)
@@ -99,18 +229,10 @@ class GoogleTTSService:
             name=voice_name,
         )
 
-        # Determine audio encoding and file extension
-        encoding_map = {
-            "MP3": texttospeech.AudioEncoding.MP3,
-            "LINEAR16": texttospeech.AudioEncoding.LINEAR16,
-            "OGG_OPUS": texttospeech.AudioEncoding.OGG_OPUS,
-        }
-        encoding = encoding_map.get(self.audio_encoding, texttospeech.AudioEncoding.MP3)
-
         audio_config = texttospeech.AudioConfig(
-            audio_encoding=encoding,
-            speaking_rate=speaking_rate or self.default_speaking_rate,
-            pitch=pitch or self.default_pitch,
+            audio_encoding=self._encoding,
+            speaking_rate=rate,
+            pitch=pitch,
         )
 
         response = client.synthesize_speech(
@@ -118,24 +240,120 @@ class GoogleTTSService:
             voice=voice,
             audio_config=audio_config,
         )
+        return response.audio_content
 
-        # Write audio content to file
-        # Adjust extension based on encoding
-        ext_map = {"MP3": ".mp3", "LINEAR16": ".wav", "OGG_OPUS": ".ogg"}
-        expected_ext = ext_map.get(self.audio_encoding, ".mp3")
+    def _serve_cached(self, key: str, cache_file: Optional[Path], output_path: Path) -> bool:
+        """Produce output_path from the memory or disk cache; False on a miss."""
+        audio = self._mem_get(key)
+        if audio is not None:
+            self._write_output(output_path, audio)
+            return True
+        return cache_file is not None and self._link_or_copy(cache_file, output_path)
 
-        # If output_path has different extension, adjust it
-        if output_path.suffix.lower() != expected_ext:
-            output_path = output_path.with_suffix(expected_ext)
+    @staticmethod
+    def _link_or_copy(cache_file: Path, output_path: Path) -> bool:
+        """Hard-link a cache entry to output_path, copying if linking fails.
 
-        output_path.write_bytes(response.audio_content)
-        return output_path
+        A link moves no audio data, so a disk hit costs the same for any clip
+        length. Entries are only ever replaced by rename, never rewritten in
+        place, so linked outputs cannot change underneath their readers.
+        The link is made under a temporary name and renamed onto output_path,
+        so an existing output (possibly itself linked to another entry) is
+        replaced rather than written through.
+        Returns False if the cache entry does not exist.
+        """
+        tmp_path = _tmp_sibling(output_path)
+        try:
+            os.link(cache_file, tmp_path)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # EXDEV (cache on another filesystem) or no link support
+            try:
+                shutil.copyfile(cache_file, tmp_path)
+            except FileNotFoundError:
+                return False
+        os.replace(tmp_path, output_path)
+        return True
 
     @staticmethod
-    def get_cache_key(text: str, voice: str, rate: float) -> str:
-        """Generate a cache key for audio content."""
-        content = f"{text}:{voice}:{rate}"
-        return hashlib.sha256(content.encode()).hexdigest()[:16]
+    def _write_output(output_path: Path, audio: bytes) -> None:
+        """Write audio to output_path without truncating whatever is there.
+
+        An existing output may be a hard link to a cache entry, so it is
+        replaced by rename instead of being rewritten in place.
+        """
+        tmp_path = _tmp_sibling(output_path)
+        try:
+            tmp_path.write_bytes(audio)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+    def _mem_get(self, key: str) -> Optional[bytes]:
+        with self._mem_lock:
+            audio = self._mem_cache.get(key)
+            if audio is not None:
+                self._mem_cache.move_to_end(key)
+            return audio
+
+    def _mem_put(self, key: str, audio: bytes) -> None:
+        if len(audio) > self.max_cache_bytes:
+            return
+        with self._mem_lock:
+            previous = self._mem_cache.pop(key, None)
+            if previous is not None:
+                self._mem_bytes -= len(previous)
+            self._mem_cache[key] = audio
+            self._mem_bytes += len(audio)
+            while self._mem_bytes > self.max_cache_bytes:
+                _, evicted = self._mem_cache.popitem(last=False)
+                self._mem_bytes -= len(evicted)
+
+    @staticmethod
+    def _store_in_cache(cache_file: Path, audio: bytes) -> bool:
+        """Write a cache entry so readers never see a partial one."""
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+        except OSError:
+            return False
+        if _O_TMPFILE:
+            stored = _store_anonymous(cache_file, audio)
+            if stored is not None:
+                return stored
+
+        tmp_path = _tmp_sibling(cache_file)
+        try:
+            tmp_path.write_bytes(audio)
+            os.replace(tmp_path, cache_file)
+            return True
+        except OSError:
+            # A read-only or full cache directory only costs future hits.
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            return False
+
+    @staticmethod
+    def get_cache_key(
+        text: str,
+        voice: str,
+        rate: float,
+        pitch: float = 0.0,
+        encoding: str = "MP3",
+    ) -> str:
+        """Generate a cache key for audio content.
+
+        Every setting that changes the audio is part of the key, so clips that
+        differ only in pitch or encoding never share a cache entry.
+        """
+        # Hashing the text and the settings suffix in two updates gives the same
+        # digest as hashing their concatenation, without building a second
+        # copy of a paragraph-length string first.
+        digest = hashlib.sha256(text.encode())
+        digest.update(f":{voice}:{rate}:{pitch}:{encoding}".encode())
+        return digest.hexdigest()[:16]
 
 
 __all__ = ["GoogleTTSService"]